@@ -0,0 +1,75 @@
+from clovis.queries import get_guild, get_or_create_guild
+from sqlalchemy.ext.asyncio import AsyncSession
+from clovis.storage import create_engine, profiles
+from sqlalchemy.orm import sessionmaker as maker
+from clovis.migrations import upgrade
+from clovis.tables import Guild
+
+import statistics
+import tempfile
+import asyncio
+import pathlib
+import time
+
+# NOTE: Compares the per-call latency of looking up a guild through the
+# ORM with the Core fast path, for guilds that already have a row (the
+# hot path) and for guilds that need one to be created.
+CALLS = 2000
+
+
+async def orm_get_or_create(engine, sessionmaker: maker, guild_id: int):
+    async with sessionmaker.begin() as session:
+        await Guild.get_or_create(session, guild_id)
+
+
+async def core_get_or_create(engine, sessionmaker: maker, guild_id: int):
+    async with engine.begin() as connection:
+        await get_or_create_guild(connection, guild_id)
+
+
+async def core_get(engine, sessionmaker: maker, guild_id: int):
+    async with engine.connect() as connection:
+        await get_guild(connection, guild_id)
+
+
+async def measure(function, engine, sessionmaker: maker, guild_ids):
+    latencies = []
+    for guild_id in guild_ids:
+        start = time.perf_counter()
+        await function(engine, sessionmaker, guild_id)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99)]
+
+
+async def benchmark(name: str, function, directory: pathlib.Path):
+    engine = create_engine(directory / f'{name}.db', profiles['wal'])
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade)
+    sessionmaker = maker(bind=engine, class_=AsyncSession)
+
+    results = []
+    if function is core_get:
+        # NOTE: The read only path never creates rows, so they are created up front.
+        await measure(core_get_or_create, engine, sessionmaker, range(CALLS))
+    else:
+        results.append(('create', await measure(function, engine, sessionmaker, range(CALLS))))
+    results.append(('existing', await measure(function, engine, sessionmaker, range(CALLS))))
+    await engine.dispose()
+
+    for label, (median, p99) in results:
+        print(f"{name:>18} {label:>8}: median {median * 1e6:8.1f}us, p99 {p99 * 1e6:8.1f}us")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for name, function in (
+            ('Guild.get_or_create', orm_get_or_create),
+            ('get_or_create_guild', core_get_or_create),
+            ('get_guild', core_get)
+        ):
+            await benchmark(name, function, pathlib.Path(directory))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
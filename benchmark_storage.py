@@ -0,0 +1,63 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from clovis.storage import create_engine, profiles
+from sqlalchemy.orm import sessionmaker as maker
+from clovis.migrations import upgrade
+from clovis.tables import Guild
+
+import tempfile
+import asyncio
+import pathlib
+import time
+
+# NOTE: Simulates a burst of members joining across a handful of
+# guilds, every worker keeps flipping a flag on its guild's row.
+GUILDS = 20
+WORKERS = 50
+TRANSACTIONS = 40
+
+
+async def worker(sessionmaker: maker, guild_id: int, results: dict):
+    for _ in range(TRANSACTIONS):
+        try:
+            async with sessionmaker.begin() as session:
+                sql_guild = await Guild.get_or_create(session, guild_id)
+                sql_guild.message_error = not sql_guild.message_error
+            results['committed'] += 1
+        except Exception as error:
+            results['failed'] += 1
+            results['errors'].add(str(getattr(error, 'orig', error)))
+
+
+async def benchmark(name: str, directory: pathlib.Path):
+    engine = create_engine(directory / f'{name}.db', profiles[name])
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade)
+    sessionmaker = maker(bind=engine, class_=AsyncSession)
+    async with sessionmaker.begin() as session:
+        session.add_all(Guild(id=guild_id) for guild_id in range(GUILDS))
+
+    results = {'committed': 0, 'failed': 0, 'errors': set()}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(sessionmaker, worker_id % GUILDS, results)
+        for worker_id in range(WORKERS)
+    ))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+
+    print(
+        f"{name:>8}: {results['committed'] / elapsed:8.1f} commits/s, "
+        f"{results['committed']} committed, {results['failed']} failed in {elapsed:.2f}s"
+    )
+    for error in results['errors']:
+        print(f"{'':>10}{error}")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for name in profiles:
+            await benchmark(name, pathlib.Path(directory))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
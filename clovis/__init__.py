@@ -1,12 +1,38 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker as maker
+from .storage import create_engine, profiles
 
 import argparse
 
 parser = argparse.ArgumentParser(description='Use this to set bot settings.')
 parser.add_argument('-nt', '--not-testing', action='store_false', dest='testing')
+parser.add_argument('--autocomplete-coalesce', type=float, default=0.1, dest='autocomplete_coalesce')
+parser.add_argument('--guild-cache-size', type=int, default=10000, dest='guild_cache_size')
+parser.add_argument('--guild-cache-ttl', type=float, default=3600, dest='guild_cache_ttl')
+parser.add_argument('--settings-flush-interval', type=float, default=1.0, dest='settings_flush_interval')
+parser.add_argument('--event-concurrency', type=int, default=8, dest='event_concurrency')
+parser.add_argument('--event-queue-warn', type=int, default=50, dest='event_queue_warn')
+parser.add_argument('--join-batch-size', type=int, default=10, dest='join_batch_size')
+parser.add_argument('--join-channel-rate', type=int, default=5, dest='join_channel_rate')
+parser.add_argument('--join-channel-period', type=float, default=5.0, dest='join_channel_period')
+parser.add_argument('--rename-quiet', type=float, default=30, dest='rename_quiet')
+parser.add_argument('--http-connections', type=int, default=20, dest='http_connections')
+parser.add_argument('--http-timeout', type=float, default=30, dest='http_timeout')
+parser.add_argument('--http-dns-ttl', type=int, default=300, dest='http_dns_ttl')
+parser.add_argument('--when2meet-workers', type=int, default=4, dest='when2meet_workers')
+parser.add_argument('--when2meet-attempts', type=int, default=5, dest='when2meet_attempts')
+parser.add_argument('--when2meet-backoff', type=float, default=5, dest='when2meet_backoff')
+parser.add_argument('--when2meet-max-backoff', type=float, default=600, dest='when2meet_max_backoff')
+parser.add_argument('--when2meet-ttl', type=float, default=86400, dest='when2meet_ttl')
+parser.add_argument('--storage-profile', choices=profiles, default='wal', dest='storage_profile')
+parser.add_argument('--in-memory', action='store_true', dest='in_memory')
+parser.add_argument('--snapshot-interval', type=float, default=60, dest='snapshot_interval')
+parser.add_argument('--snapshot-writes', type=int, default=100, dest='snapshot_writes')
+parser.add_argument('--snapshot-max-loss', type=float, default=300, dest='snapshot_max_loss')
 config = parser.parse_args()
 
-engine = create_async_engine(f"sqlite+aiosqlite:///{':memory:' if config.testing else 'bot.db'}")
+# NOTE: With --in-memory the database is loaded from bot.db at
+# startup and saved back to it by clovis.snapshot.Snapshotter.
+engine = create_engine(':memory:' if config.testing or config.in_memory else 'bot.db', profiles[config.storage_profile])
 
 sessionmaker = maker(bind=engine, class_=AsyncSession)
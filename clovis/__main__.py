@@ -1,9 +1,15 @@
 from .logs import setUpLogger, setUpHandler, logs_dir, console
-from .utils import load_timezones, autocomplete_logger
+from .timezones import load_timezones, autocomplete_cache, autocomplete, refresh_offsets
+from .utils import autocomplete_logger
+from .migrations import migrate
+from .snapshot import Snapshotter
+from .settings import guild_settings
+from .web import start_session, close_session
 from .bot import bot
-from . import config
+from . import config, engine
 
 import logging
+import pathlib
 
 handlers = [console]
 if config.testing:
@@ -24,10 +30,39 @@ else:
     )
     handlers += [everything, errors]
 
-for name in ['bot', 'automated', 'commands', 'utils']:
+for name in ['bot', 'automated', 'commands', 'utils', 'timezones', 'settings', 'migrations', 'snapshot', 'dispatch', 'joins', 'pool', 'renames', 'web', 'jobs']:
     setUpLogger(f'clovis.{name}', handlers=handlers)
 
 load_timezones()
+if autocomplete:
+    autocomplete_cache()
+    bot.loop.create_task(refresh_offsets())
+
+snapshotter = None
+if config.in_memory and not config.testing:
+    snapshotter = Snapshotter(
+        engine,
+        pathlib.Path('bot.db'),
+        config.snapshot_interval,
+        config.snapshot_writes,
+        config.snapshot_max_loss
+    )
+    bot.loop.run_until_complete(snapshotter.load())
+
+# NOTE: The schema is brought up to date before connecting
+# to the gateway so no events are received while it changes.
+bot.loop.run_until_complete(migrate(engine))
+
+bot.loop.run_until_complete(
+    start_session(config.http_connections, config.http_timeout, config.http_dns_ttl)
+)
+bot.cleanups.append(close_session)
+bot.loop.create_task(guild_settings.run())
+bot.cleanups.append(guild_settings.flush)
+if snapshotter is not None:
+    bot.loop.create_task(snapshotter.run())
+    bot.cleanups.append(snapshotter.save)
+bot.cleanups.append(engine.dispose)
 
 with open('test-token.txt' if config.testing else 'token.txt') as file:
     bot.run(file.read())
@@ -1,10 +1,18 @@
 from dateutil.relativedelta import relativedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from .utils import hardened_fetch_channel
-from . import sessionmaker, engine
-from .tables import Guild, mapper
+from .utils import hardened_fetch_channel, private_channel_owner
+from . import sessionmaker, engine, queries, config
+from .dispatch import EventDispatcher
+from .joins import JoinPipeline, RateBucket
+from .pool import ChannelPool, hidden_overwrites
+from .renames import RenameScheduler
+from .jobs import When2MeetEvents, When2MeetJobQueue
+from .settings import guild_settings, GuildSettings
+from .tables import Guild, PooledChannel, PrivateChannel, When2MeetTemplate
+from .migrations import db_ready
 from datetime import datetime
-from sqlalchemy import text
+from typing import List, Optional
+from sqlalchemy import select
 from .bot import bot
 
 import asyncio
@@ -14,20 +22,105 @@ import sys
 
 logger = logging.getLogger(__name__)
 
-db_created = asyncio.Event()
+private_channels_indexed = asyncio.Event()
+
+# NOTE: Handlers decorated with event_dispatcher.serialize() only queue the
+# event, it is handled after the events that came before it in the same guild.
+event_dispatcher = EventDispatcher(bot, config.event_concurrency, config.event_queue_warn)
+
+rename_scheduler = RenameScheduler(config.rename_quiet)
+
+when2meet_jobs = When2MeetJobQueue(
+    bot.get_channel,
+    When2MeetEvents(config.when2meet_ttl),
+    config.when2meet_workers,
+    config.when2meet_attempts,
+    config.when2meet_backoff,
+    config.when2meet_max_backoff
+)
 
 @bot.event
 async def on_ready():
-    # NOTE: It cannot be done using SQLAlchemy, a custom implementation is needed.
-    # See here: https://github.com/sqlalchemy/sqlalchemy/discussions/7883#discussioncomment-2485436
-    async with engine.begin() as conn:
-        await conn.execute(text('PRAGMA foreign_keys=ON'))
-        await conn.run_sync(mapper.metadata.create_all)
-    db_created.set()
+    # NOTE: on_ready is also called after reconnecting to the gateway.
+    if not private_channels_indexed.is_set():
+        await db_ready.wait()
+        try:
+            await reconcile_guilds()
+            for guild in bot.guilds:
+                # NOTE: One guild failing should not keep the others from being set up.
+                try:
+                    await index_private_channels(guild)
+                    if (await guild_settings.get(guild.id)).channel_pool_size:
+                        channel_pool.request_refill(guild)
+                    await rename_scheduler.restore(guild)
+                except Exception as error:
+                    logger.error(f"Failed to set up the '{guild}' server after starting.", exc_info=error)
+            private_channels_indexed.set()
+        finally:
+            # NOTE: Started once the channel cache is filled so jobs left over
+            # from the last run can find their channel, whatever happened above.
+            when2meet_jobs.start()
     logger.info(f"{bot.user} is ready!")
 
+def join_message_id(guild: discord.Guild) -> Optional[int]:
+    if guild.system_channel and guild.system_channel_flags.join_notifications:
+        return guild.system_channel.last_message_id
+    return None
+
+async def reconcile_guilds():
+    # NOTE: Catches up on the guilds the bot joined or was removed
+    # from while it was offline and warms up the settings cache.
+    async with engine.begin() as connection:
+        rows = {row.id: row for row in await queries.get_guilds(connection)}
+        missing = {guild.id: join_message_id(guild) for guild in bot.guilds if guild.id not in rows}
+        joined = {guild.id for guild in bot.guilds}
+        orphaned = [guild_id for guild_id, row in rows.items() if guild_id not in joined and not row.orphaned]
+        returned = [guild_id for guild_id, row in rows.items() if guild_id in joined and row.orphaned]
+        await queries.insert_guilds(connection, missing)
+        await queries.set_orphaned(connection, orphaned, True)
+        await queries.set_orphaned(connection, returned, False)
+        if missing or returned:
+            rows = {row.id: row for row in await queries.get_guilds(connection)}
+    for guild in bot.guilds:
+        guild_settings.put(GuildSettings.from_guild(rows[guild.id]))
+    logger.info(
+        f"Reconciled {len(bot.guilds)} servers with the database: {len(missing)} added, "
+        f"{len(orphaned)} orphaned and {len(returned)} returned."
+    )
+
+async def index_private_channels(guild: discord.Guild):
+    settings = await guild_settings.get(guild.id)
+    category = await hardened_fetch_channel(settings.create_category_id, guild, None)
+    async with sessionmaker.begin() as session:
+        # NOTE: Private channels can be moved out of the category
+        # (e.g. into the when2meet category) so only the channels
+        # which no longer exist are removed from the index.
+        private_channels = await session.execute(
+            select(PrivateChannel).where(PrivateChannel.guild_id == guild.id)
+        )
+        for private_channel in private_channels.scalars():
+            if guild.get_channel(private_channel.channel_id) is None:
+                await session.delete(private_channel)
+        await session.flush()
+        if category:
+            for text_channel in category.text_channels:
+                if not (owner := private_channel_owner(text_channel)):
+                    continue
+                # NOTE: The channel may have been given to someone else while
+                # the bot was offline, the old row has to go before the insert.
+                private_channel = (await session.execute(
+                    select(PrivateChannel).where(PrivateChannel.channel_id == text_channel.id)
+                )).scalar_one_or_none()
+                if private_channel and private_channel.member_id != owner.id:
+                    await session.delete(private_channel)
+                    await session.flush()
+                await session.merge(PrivateChannel(guild.id, owner.id, text_channel.id))
+    logger.info(f"Indexed the private channels in the '{guild}' server.")
+
 @bot.event
+@event_dispatcher.serialize(lambda guild: guild.id)
 async def on_guild_join(guild: discord.Guild):
+    await db_ready.wait()
     if not guild.me.guild_permissions.administrator:
         message = f"The bot immediately left the '{guild}' server due to a lack of permissions."
         if guild.owner:
@@ -56,6 +149,7 @@ async def on_guild_join(guild: discord.Guild):
             if sql_guild := await session.get(Guild, guild.id):
                 logger.info(f"{logger_message} which it was previously in.")
                 sql_guild: Guild = sql_guild
+                sql_guild.orphaned = False
                 if guild.owner:
                     message = message.format(' back')
                     category = await hardened_fetch_channel(sql_guild.create_category_id, guild, None)
@@ -68,204 +162,253 @@ async def on_guild_join(guild: discord.Guild):
                         )
             else:
                 logger.info(f"{logger_message}.")
-                last_message_id = None
-                if guild.system_channel and guild.system_channel_flags.join_notifications:
-                    last_message_id = guild.system_channel.last_message_id
-                sql_guild = Guild(id=guild.id, last_message_id=last_message_id)
+                sql_guild = Guild(id=guild.id, last_message_id=join_message_id(guild))
                 message = message.format('')
                 session.add(sql_guild)
                 message += "Please set a category to create new channels in with the `/set category` command."
+            settings = GuildSettings.from_guild(sql_guild)
+        guild_settings.put(settings)
 
         if guild.owner:
             await guild.owner.send(message)
             logger.info('The owner was notified about the bot joining.')
 
+@bot.event
+@event_dispatcher.serialize(lambda guild: guild.id)
+async def on_guild_remove(guild: discord.Guild):
+    await db_ready.wait()
+    async with engine.begin() as connection:
+        await queries.set_orphaned(connection, [guild.id], True)
+    guild_settings.invalidate(guild.id)
+    logger.info(f"The bot was removed from the '{guild}' server.")
+
 @bot.event
 async def on_member_join(member: discord.Member):
     if not member.bot:
-        failed_log = False
         logger.debug(f"{member} joined the server.")
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, member.guild.id)
-            if member.guild.me.guild_permissions.administrator:
-                if sql_guild.listen:
-                    category = await hardened_fetch_channel(sql_guild.create_category_id, member.guild)
-                    channel = await member.guild.create_text_channel(
+        join_pipeline.submit(member)
+
+@bot.event
+async def on_member_remove(member: discord.Member):
+    join_pipeline.discard(member)
+
+async def welcome_members(guild: discord.Guild, members: List[discord.Member], bucket: RateBucket) -> List[discord.Member]:
+    await db_ready.wait()
+    settings = await guild_settings.get(guild.id)
+    if not guild.me.guild_permissions.administrator:
+        if settings.message_error and guild.owner:
+            await guild.owner.send(
+                "Uh oh! Someone accidentally removed my admin permission! "
+                "I can no longer create new private channels until this permission "
+                "is restored."
+            )
+            await guild_settings.update(guild.id, message_error=False)
+        logger.warning(
+            f"The bot failed to make private channels for {len(members)} members "
+            "due to permission errors."
+        )
+        return []
+    if not settings.listen:
+        return members
+
+    category = await hardened_fetch_channel(settings.create_category_id, guild)
+    welcomed = []
+    private_channels = []
+    try:
+        for member in members:
+            # NOTE: Channel creation shares one rate limit per guild, so it is
+            # paced by the bucket. Claiming a pooled channel and sending the
+            # welcome message are rate limited per channel instead.
+            overwrites = {
+                **hidden_overwrites(guild),
+                member: discord.PermissionOverwrite(
+                    view_channel=True,
+                    read_message_history=True,
+                    send_messages=True
+                )
+            }
+            try:
+                if settings.channel_pool_size and (channel := await channel_pool.claim(member, category, overwrites)):
+                    logger.info(f"{member} was given the pooled #{channel} channel.")
+                else:
+                    await bucket.acquire()
+                    channel = await guild.create_text_channel(
                         member.display_name,
                         category=category,
-                        overwrites={
-                            member.guild.default_role: discord.PermissionOverwrite.from_pair(
-                                discord.Permissions.none(),
-                                discord.Permissions.all()
-                            ),
-                            member: discord.PermissionOverwrite(
-                                view_channel=True,
-                                read_message_history=True,
-                                send_messages=True
-                            )
-                        }
+                        overwrites=overwrites
                     )
                     logger.info(f"{member}'s private channel was successfully created!")
-                    placeholders = [member.mention]
-                    if sql_guild.welcome_channel_id:
-                        placeholders.append(sql_guild.mention_welcome)
-
-                    await channel.send(sql_guild.welcome_message.format(*placeholders))
-                    logger.info(f"Successfully sent welcome message in {member}'s private channel.")
-
-                    if (
-                        not sql_guild.welcome_channel_id
-                        and sql_guild.message_missing_welcome_channel
-                        and member.guild.owner
-                    ):
-                        logger.warning(f'There is no welcome channel set in {member.guild}.')
-                        await member.guild.owner.send(
-                            "There is currently no welcome channel set. "
-                            "Please use `/set welcome channel` command "
-                            "to set a welcome channel."
-                        )
-                        logger.info('Successfully notified the server owner about the issue.')
-                        sql_guild.message_missing_welcome_channel = False
-
-            elif sql_guild.message_error:
-                if member.guild.owner:
-                    await member.guild.owner.send(
-                        "Uh oh! Someone accidentally removed my admin permission! "
-                        "I can no longer create new private channels until this permission "
-                        "is restored."
-                    )
-                    sql_guild.message_error = False
-                failed_log = True
-            else:
-                failed_log = True
+                private_channels.append(PrivateChannel(guild.id, member.id, channel.id))
+                placeholders = [member.mention]
+                if settings.welcome_channel_id:
+                    placeholders.append(settings.mention_welcome)
 
-            if failed_log:
-                logger.warning(
-                    f"The bot failed to make a private channel for {member} "
-                    "due to permission errors."
-                )
+                await channel.send(settings.welcome_message.format(*placeholders))
+                logger.info(f"Successfully sent welcome message in {member}'s private channel.")
+                welcomed.append(member)
+            except discord.HTTPException as error:
+                logger.error(f"Failed to create the private channel for {member}.", exc_info=error)
+    finally:
+        # NOTE: The whole batch is indexed in one transaction.
+        if private_channels:
+            async with sessionmaker.begin() as session:
+                for private_channel in private_channels:
+                    await session.merge(private_channel)
+        if settings.channel_pool_size:
+            channel_pool.request_refill(guild)
+
+    if (
+        welcomed
+        and not settings.welcome_channel_id
+        and settings.message_missing_welcome_channel
+        and guild.owner
+    ):
+        logger.warning(f'There is no welcome channel set in {guild}.')
+        await guild.owner.send(
+            "There is currently no welcome channel set. "
+            "Please use `/set welcome channel` command "
+            "to set a welcome channel."
+        )
+        logger.info('Successfully notified the server owner about the issue.')
+        await guild_settings.update(guild.id, message_missing_welcome_channel=False)
+    return welcomed
+
+join_pipeline = JoinPipeline(welcome_members, config.join_batch_size, config.join_channel_rate, config.join_channel_period)
+
+# NOTE: The pool is refilled with the same bucket as the pipeline
+# once the pipeline has no members queued for the guild.
+channel_pool = ChannelPool(
+    lambda guild_id: join_pipeline.buckets.setdefault(
+        guild_id, RateBucket(config.join_channel_rate, config.join_channel_period)
+    ),
+    lambda guild_id: guild_id in join_pipeline.workers,
+    config.join_channel_period
+)
+
+@bot.event
+async def on_channel_pool_resize(guild: discord.Guild):
+    channel_pool.request_refill(guild)
 
 @bot.event
+@event_dispatcher.serialize(lambda before, after: after.guild.id)
 async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    await db_ready.wait()
     if after.is_bot_managed() and after in after.guild.me.roles:
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, after.guild.id)
-            if not after.permissions.administrator and sql_guild.message_error:
-                logger.warning("Someone accidentally removed the bot's admin permission.")
-                if after.guild.owner:
-                    await after.guild.owner.send(
-                        "Uh oh! Someone accidentally removed my admin permission! "
-                        "I can no longer create new private channels until this permission "
-                        "is restored."
-                    )
-                    sql_guild.message_error = False
-                    logger.info("The owner was notified about the missing permission.")
-            elif not before.permissions.administrator and after.permissions.administrator:
-                logger.info("The bot's admin permission has been restored.")
-                sql_guild.message_error = True
-                if after.guild.owner:
-                    await after.guild.owner.send(
-                        "My admin permission has been restored and I will now continue to "
-                        "create new private channels."
-                    )
-                    logger.info("The owner was notified about the correction to the bot's role.")
+        settings = await guild_settings.get(after.guild.id)
+        if not after.permissions.administrator and settings.message_error:
+            logger.warning("Someone accidentally removed the bot's admin permission.")
+            if after.guild.owner:
+                await after.guild.owner.send(
+                    "Uh oh! Someone accidentally removed my admin permission! "
+                    "I can no longer create new private channels until this permission "
+                    "is restored."
+                )
+                await guild_settings.update(after.guild.id, message_error=False)
+                logger.info("The owner was notified about the missing permission.")
+        elif not before.permissions.administrator and after.permissions.administrator:
+            logger.info("The bot's admin permission has been restored.")
+            await guild_settings.update(after.guild.id, message_error=True)
+            if after.guild.owner:
+                await after.guild.owner.send(
+                    "My admin permission has been restored and I will now continue to "
+                    "create new private channels."
+                )
+                logger.info("The owner was notified about the correction to the bot's role.")
 
 @bot.event
+@event_dispatcher.serialize(lambda before, after: after.guild.id)
 async def on_member_update(before: discord.Member, after: discord.Member):
-    await db_created.wait()
-    async with sessionmaker.begin() as session:
-        sql_guild = await Guild.get_or_create(session, after.guild.id)
-        if not after.bot and before.nick != after.nick and sql_guild.create_category_id:
-            logger.debug(f"{after} changed their nickname from {before.nick!r} to {after.nick!r}.")
+    await db_ready.wait()
+    settings = await guild_settings.get(after.guild.id)
+    if not after.bot and before.nick != after.nick and settings.create_category_id:
+        logger.debug(f"{after} changed their nickname from {before.nick!r} to {after.nick!r}.")
 
-            try:
-                admins = None
-                category = await hardened_fetch_channel(sql_guild.create_category_id, before.guild)
-                for text_channel in category.text_channels:
-                    if admins is None:
-                        admins = set(
-                            map(
-                                lambda member: member.id,
-                                filter(
-                                    lambda member: member.guild_permissions.administrator,
-                                    text_channel.members
-                                )
-                            )
-                        )
-                    person = set(map(lambda member: member.id, text_channel.members)) - admins
-                    if len(person) > 1:
-                        raise ValueError(
-                            f"Multiple people detected in the private text channel: {text_channel}."
-                        )
-                    elif len(person) == 0:
-                        raise ValueError(
-                            f"No one detected in the private text channel: {text_channel}."
-                        )
+        async with sessionmaker.begin() as session:
+            private_channel = await session.get(PrivateChannel, (after.guild.id, after.id))
 
-                    if person.pop() == after.id:
-                        await text_channel.edit(
-                            name=after.nick if after.nick else after.name,
-                            reason="Updating channel to the user's real name (as inferred from their nickname)."
-                        )
-                        logger.info(f"Successfully updated the name of {after}'s private channel to {after.nick!r}")
-                        break
-                else:
-                    raise ValueError(f"Failed to locate {after}'s private channel.")
-            except ValueError as error:
-                logger.warning(
-                    f"Failed to locate {after}'s private channel, "
-                    "it may be because they are an admin and do not have one.",
-                    exc_info=error
-                )
+        text_channel = None
+        if private_channel:
+            text_channel = await hardened_fetch_channel(private_channel.channel_id, after.guild, None)
+            if text_channel is None:
+                async with sessionmaker.begin() as session:
+                    await PrivateChannel.remove(session, private_channel.channel_id)
+
+        if text_channel:
+            await rename_scheduler.schedule(after.guild, text_channel.id, after.nick if after.nick else after.name)
+            logger.info(f"Scheduled renaming {after}'s private channel to {after.nick!r}")
+        else:
+            logger.warning(
+                f"Failed to locate {after}'s private channel, "
+                "it may be because they are an admin and do not have one."
+            )
 
 @bot.event
+@event_dispatcher.serialize(lambda before, after: after.guild.id)
 async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    await db_ready.wait()
+    if isinstance(after, discord.TextChannel) and before.overwrites != after.overwrites:
+        async with sessionmaker.begin() as session:
+            private_channel = (await session.execute(
+                select(PrivateChannel).where(PrivateChannel.channel_id == after.id)
+            )).scalar_one_or_none()
+            if private_channel:
+                await session.delete(private_channel)
+                # NOTE: Flush so the delete happens before the insert below.
+                await session.flush()
+                if owner := private_channel_owner(after):
+                    await session.merge(PrivateChannel(after.guild.id, owner.id, after.id))
+                    logger.info(f"Updated the owner of the #{after} private channel to {owner}.")
+                else:
+                    logger.info(f"The #{after} channel is no longer a private channel.")
+
     if isinstance(after, discord.TextChannel) and after.category and before.category != after.category:
         logger.debug(f'The {after} channel was updated in {after.guild}!')
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, after.guild.id)
-            if sql_guild.when2meet_category_id:
-                category = await hardened_fetch_channel(sql_guild.when2meet_category_id, after.guild, None)
-                if category:
-                    logger.info(
-                        f'Detected the when2meet_category_id as a valid category '
-                        f'in the {after.guild} server.'
-                    )
-                    if after.category.id == sql_guild.when2meet_category_id:
-                        when2meet = sql_guild.when2meet.format(after.name.replace('-', ' ').title())
-                        when2meet.possible_dates = list(
-                            map(
-                                lambda date: datetime.today() + relativedelta(
-                                    weekday=date.weekday()
-                                ),
-                                sql_guild.when2meet.possible_dates
-                            )
-                        )
-                        url = await when2meet.create_event()
-                        logger.info(
-                            f'Successfully created the when2meet for the #{after} channel.'
-                        )
-                        await after.send(
-                            embed=when2meet.create_embed(),
-                            view=when2meet.create_view(url)
-                        )
-                        logger.info(
-                            f'Successfully sent message for the when2meet in the #{after} channel.'
+        settings = await guild_settings.get(after.guild.id)
+        if settings.when2meet_category_id:
+            category = await hardened_fetch_channel(settings.when2meet_category_id, after.guild, None)
+            if category:
+                logger.info(
+                    f'Detected the when2meet_category_id as a valid category '
+                    f'in the {after.guild} server.'
+                )
+                if after.category.id == settings.when2meet_category_id:
+                    async with sessionmaker.begin() as session:
+                        template = (await session.get(When2MeetTemplate, after.guild.id)).to_when2meet()
+                    when2meet = template.format(after.name.replace('-', ' ').title())
+                    when2meet.possible_dates = list(
+                        map(
+                            lambda date: datetime.today() + relativedelta(
+                                weekday=date.weekday()
+                            ),
+                            template.possible_dates
                         )
-                else:
-                    message = (
-                        "Detected the when2meet_category_id as an "
-                        f"invalid category in the {after.guild} server."
                     )
-                    sql_guild.when2meet_category_id = None
-                    if after.guild.owner:
-                        await after.guild.owner.send(
-                            'The category for automatically creating when2meets '
-                            'has been deleted! Please set a new one with the `/set when2meet '
-                            'category` command.'
-                        )
-                        message += " Notified the owner about the issue."
-                    logger.warning(message)
+                    await when2meet_jobs.enqueue(after, when2meet)
+                    logger.info(f'Queued creating the when2meet for the #{after} channel.')
+            else:
+                message = (
+                    "Detected the when2meet_category_id as an "
+                    f"invalid category in the {after.guild} server."
+                )
+                await guild_settings.update(after.guild.id, when2meet_category_id=None)
+                if after.guild.owner:
+                    await after.guild.owner.send(
+                        'The category for automatically creating when2meets '
+                        'has been deleted! Please set a new one with the `/set when2meet '
+                        'category` command.'
+                    )
+                    message += " Notified the owner about the issue."
+                logger.warning(message)
+
+@bot.event
+@event_dispatcher.serialize(lambda channel: channel.guild.id)
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    await db_ready.wait()
+    if isinstance(channel, discord.TextChannel):
+        async with sessionmaker.begin() as session:
+            await PrivateChannel.remove(session, channel.id)
+            await PooledChannel.remove(session, channel.id)
+        await rename_scheduler.cancel(channel.id)
 
 @bot.event
 async def on_error(event: str, *args, **kwargs):
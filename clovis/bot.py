@@ -1,9 +1,31 @@
+from typing import Awaitable, Callable, List
 from .commands import CommandsCog
 from . import config
 
 import discord
+import logging
 
-bot = discord.Bot(
+logger = logging.getLogger(__name__)
+
+
+class Clovis(discord.Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # NOTE: Run in order after the gateway connection is closed,
+        # this also happens when the bot is stopped with Ctrl+C or SIGTERM.
+        self.cleanups: List[Callable[[], Awaitable]] = []
+
+    async def close(self):
+        await super().close()
+        while self.cleanups:
+            cleanup = self.cleanups.pop(0)
+            try:
+                await cleanup()
+            except Exception as error:
+                logger.error(f"Failed to run {cleanup.__qualname__} on shutdown.", exc_info=error)
+
+
+bot = Clovis(
     debug_guilds=[810742455745773579] if config.testing else None,
     intents=discord.Intents(guilds=True, members=True)
 )
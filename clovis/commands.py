@@ -1,7 +1,9 @@
 from discord.commands import Option
 from discord.ext import commands
-from . import sessionmaker
-from .tables import Guild
+from .settings import guild_settings
+from .migrations import db_ready
+from sqlalchemy.ext.asyncio import async_object_session
+from .tables import Guild, When2MeetTemplate
 from dateutil import tz
 from .utils import (
     autocomplete_timezones,
@@ -56,6 +58,9 @@ class CommandsCog(commands.Cog):
         "Commands used to create something."
     )
 
+    async def cog_before_invoke(self, ctx: discord.ApplicationContext):
+        await db_ready.wait()
+
     @set_commands.command(
         name='category',
         description="Use this command to set the category in which new channels will be created in.",
@@ -72,8 +77,7 @@ class CommandsCog(commands.Cog):
     async def set_category(self, ctx: discord.ApplicationContext, channel: discord.CategoryChannel):
         # NOTE: Must have the admin permission to be able to create private channels
         if ctx.me.guild_permissions.administrator:
-            async with sessionmaker.begin() as session:
-                sql_guild = await Guild.get_or_create(session, ctx.guild_id)
+            async with guild_settings.edit(ctx.guild_id) as sql_guild:
                 sql_guild.create_category_id = channel.id
                 # NOTE: Might want to be careful here of automatically setting the bot to listen.
                 sql_guild.create_channel = True
@@ -90,30 +94,56 @@ class CommandsCog(commands.Cog):
                 "but the bot did not have the admin permission."
             )
 
+    @set_commands.command(
+        name='pool',
+        description="Use this command to set how many hidden channels to keep ready for new members.",
+        options=[
+            Option(
+                int,
+                name='size',
+                description="The number of channels to keep ready, 0 turns the pool off.",
+                min_value=0,
+                max_value=50
+            )
+        ]
+    )
+    @commands.has_guild_permissions(administrator=True)
+    async def set_pool(self, ctx: discord.ApplicationContext, size: int):
+        await guild_settings.update(ctx.guild_id, channel_pool_size=size)
+        # NOTE: Handled by on_channel_pool_resize in the automated module.
+        ctx.bot.dispatch('channel_pool_resize', ctx.guild)
+        if size:
+            message = (
+                f"I will keep {size} hidden channels ready in the private channel category "
+                "so new members get their channel right away."
+            )
+        else:
+            message = "I will no longer keep channels ready for new members."
+        await ctx.respond(message)
+        logger.info(f"{ctx.author} used the /set pool command to set the pool size to {size}.")
+
     @get_commands.command(
         name='category',
         description="Use this command find out which category is currently being used to create new channels."
     )
     @commands.has_guild_permissions(administrator=True)
     async def get_category(self, ctx: discord.ApplicationContext):
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, ctx.guild_id)
-            if category := await hardened_fetch_channel(
-                sql_guild.create_category_id, ctx.guild, default=None
-            ):
-                message = f'The current category set is {category.mention}.'
-            else:
-                if sql_guild.create_category_id:
-                    message = (
-                        "The previously set category channel was deleted, "
-                        "please set a new one with the `/set category` command."
-                    )
-                else:
-                    message = (
-                        "This server does not currently have category, "
-                        "set one using `/set category` command."
-                    )
-                sql_guild.create_category_id = None
+        settings = await guild_settings.get(ctx.guild_id)
+        if category := await hardened_fetch_channel(
+            settings.create_category_id, ctx.guild, default=None
+        ):
+            message = f'The current category set is {category.mention}.'
+        elif settings.create_category_id:
+            message = (
+                "The previously set category channel was deleted, "
+                "please set a new one with the `/set category` command."
+            )
+            await guild_settings.update(ctx.guild_id, create_category_id=None)
+        else:
+            message = (
+                "This server does not currently have category, "
+                "set one using `/set category` command."
+            )
         await ctx.respond(message)
         logger.info(f"{ctx.author} used the /get category command.")
 
@@ -130,8 +160,7 @@ class CommandsCog(commands.Cog):
     )
     @commands.has_guild_permissions(administrator=True)
     async def set_welcome_channel(self, ctx: discord.ApplicationContext, channel: discord.TextChannel):
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, ctx.guild_id)
+        async with guild_settings.edit(ctx.guild_id) as sql_guild:
             sql_guild.welcome_channel_id = channel.id
             if sql_guild.welcome_message == Guild.default_message:
                 sql_guild.welcome_message += (
@@ -147,23 +176,22 @@ class CommandsCog(commands.Cog):
     )
     @commands.guild_only()
     async def get_welcome_channel(self, ctx: discord.ApplicationContext):
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, ctx.guild_id)
-            if sql_guild.welcome_channel_id:
-                channel = await hardened_fetch_channel(sql_guild.welcome_channel_id, ctx.guild, None)
-                if channel:
-                    await ctx.respond(f"{channel.mention} is currently set as the welcome channel.")
-                else:
-                    sql_guild.welcome_channel_id = None
-                    await ctx.respond(
-                        "The previously set welcome channel has been deleted! "
-                        "Please set a new one with the `/set welcome channel` command."
-                    )
+        settings = await guild_settings.get(ctx.guild_id)
+        if settings.welcome_channel_id:
+            channel = await hardened_fetch_channel(settings.welcome_channel_id, ctx.guild, None)
+            if channel:
+                await ctx.respond(f"{channel.mention} is currently set as the welcome channel.")
             else:
+                await guild_settings.update(ctx.guild_id, welcome_channel_id=None)
                 await ctx.respond(
-                    "There is currently no welcome channel. "
-                    "Set one using the `/set welcome channel` command."
+                    "The previously set welcome channel has been deleted! "
+                    "Please set a new one with the `/set welcome channel` command."
                 )
+        else:
+            await ctx.respond(
+                "There is currently no welcome channel. "
+                "Set one using the `/set welcome channel` command."
+            )
         logger.info(f"{ctx.author} used the /get welcome channel command.")
 
     @welcome_set_command.command(
@@ -176,16 +204,15 @@ class CommandsCog(commands.Cog):
         logger.info(f"{ctx.author} used the /set welcome message command. ID: {id(ctx)}")
         async def edit_button_callback(interaction: discord.Interaction):
             logger.info(f'{interaction.user} clicked the Edit Message button. ID: {id(ctx)}')
-            async with sessionmaker.begin() as session:
-                sql_guild = await Guild.get_or_create(session, interaction.guild_id)
-                modal = WelcomeModal(
-                    ctx,
-                    'Welcome Message',
-                    'Message',
-                    edit_button.og_message,
-                    sql_guild.welcome_message
-                )
-                await interaction.response.send_modal(modal)
+            settings = await guild_settings.get(interaction.guild_id)
+            modal = WelcomeModal(
+                ctx,
+                'Welcome Message',
+                'Message',
+                edit_button.og_message,
+                settings.welcome_message
+            )
+            await interaction.response.send_modal(modal)
             logger.info(f'Successfully sent the modal. ID: {id(ctx)}')
 
         edit_button = discord.ui.Button(
@@ -203,16 +230,15 @@ class CommandsCog(commands.Cog):
         )
         edit_button.callback = edit_button_callback
 
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, ctx.guild_id)
-            args = [ctx.bot.user.mention]
-            if sql_guild.welcome_channel_id:
-                args.append(sql_guild.mention_welcome)
+        settings = await guild_settings.get(ctx.guild_id)
+        args = [ctx.bot.user.mention]
+        if settings.welcome_channel_id:
+            args.append(settings.mention_welcome)
 
-            await ctx.respond(
-                edit_button.og_message.format(sql_guild.welcome_message.format(*args)),
-                view=discord.ui.View(edit_button, timeout=None)
-            )
+        await ctx.respond(
+            edit_button.og_message.format(settings.welcome_message.format(*args)),
+            view=discord.ui.View(edit_button, timeout=None)
+        )
 
     @start_commands.command(
         name='listening',
@@ -249,13 +275,12 @@ class CommandsCog(commands.Cog):
         message: str,
         alt_message: str
     ):
-        async with sessionmaker.begin() as session:
-            sql_guild = await Guild.get_or_create(session, ctx.guild_id)
-            if action is sql_guild.create_channel:
-                await ctx.respond(alt_message)
-            else:
-                sql_guild.create_channel = action
-                await ctx.respond(message)
+        settings = await guild_settings.get(ctx.guild_id)
+        if action is settings.create_channel:
+            await ctx.respond(alt_message)
+        else:
+            await guild_settings.update(ctx.guild_id, create_channel=action)
+            await ctx.respond(message)
 
     @create_commands.command(
         name='when2meet',
@@ -366,10 +391,11 @@ class CommandsCog(commands.Cog):
             await paginator.ready.wait()
 
             when2meet = paginator.create_when2meet(event_name, timezone)
-            async with sessionmaker.begin() as session:
-                sql_guild = await Guild.get_or_create(session, ctx.guild_id)
+            async with guild_settings.edit(ctx.guild_id) as sql_guild:
                 sql_guild.when2meet_category_id = category.id
-                sql_guild.when2meet = when2meet
+                await async_object_session(sql_guild).merge(
+                    When2MeetTemplate.from_when2meet(ctx.guild_id, when2meet)
+                )
 
             logger.info(
                 f'{ctx.author} successfully set the when2meet and category id in the DB. ID: {id(paginator)}'
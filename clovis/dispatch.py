@@ -0,0 +1,74 @@
+from typing import Awaitable, Callable, Deque, Dict, Tuple
+from collections import deque
+from functools import wraps
+
+import asyncio
+import discord
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Awaitable[None]]
+
+
+class EventDispatcher:
+    # NOTE: Every guild gets its own queue with a single worker, so the events
+    # of a guild are handled one at a time in the order they arrived while
+    # other guilds carry on in parallel. The semaphore bounds how many events
+    # are handled at once across all guilds.
+    def __init__(self, bot: discord.Bot, concurrency: int, warn_depth: int):
+        self.bot = bot
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.warn_depth = warn_depth
+        self.queues: Dict[int, Deque[Tuple[float, str, Handler, tuple]]] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+        self.processed = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+
+    def depth(self, guild_id: int) -> int:
+        return len(self.queues.get(guild_id, ()))
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            'guilds': len(self.queues),
+            'queued': sum(map(len, self.queues.values())),
+            'max_depth': self.max_depth,
+            'processed': self.processed,
+            'average_wait': self.total_wait / self.processed if self.processed else 0.0
+        }
+
+    def submit(self, guild_id: int, event: str, handler: Handler, args: tuple):
+        queue = self.queues.setdefault(guild_id, deque())
+        queue.append((time.monotonic(), event, handler, args))
+        self.max_depth = max(self.max_depth, len(queue))
+        if len(queue) % self.warn_depth == 0:
+            logger.warning(f"{len(queue)} events are queued for the guild with id {guild_id}. Metrics: {self.metrics()}")
+        if guild_id not in self.workers:
+            self.workers[guild_id] = asyncio.create_task(self.work(guild_id))
+
+    async def work(self, guild_id: int):
+        queue = self.queues[guild_id]
+        try:
+            while queue:
+                queued, event, handler, args = queue.popleft()
+                async with self.semaphore:
+                    self.total_wait += time.monotonic() - queued
+                    try:
+                        await handler(*args)
+                    except Exception:
+                        await self.bot.on_error(event, *args)
+                    self.processed += 1
+        finally:
+            # NOTE: Idle guilds do not keep a queue or a task around.
+            del self.workers[guild_id]
+            del self.queues[guild_id]
+
+    def serialize(self, guild_id: Callable[..., int]) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            @wraps(handler)
+            async def enqueue(*args):
+                self.submit(guild_id(*args), handler.__name__, handler, args)
+            return enqueue
+        return decorator
@@ -0,0 +1,193 @@
+from typing import Callable, Dict, List, Optional, Set
+from .tables import When2MeetEvent, When2MeetJob
+from sqlalchemy import delete, func, select
+from datetime import datetime, timedelta
+from . import sessionmaker
+
+import asyncio
+import discord
+import hashlib
+import logging
+import random
+import json
+
+logger = logging.getLogger(__name__)
+
+
+class When2MeetEvents:
+    # NOTE: Makes posting a when2meet idempotent. The event created for a
+    # channel and payload is reused for ttl seconds and is not posted to the
+    # channel a second time, e.g. when a channel is moved out of the when2meet
+    # category and back in, and identical requests that arrive while one is
+    # still running wait for it instead of creating another event.
+    def __init__(self, ttl: float):
+        self.ttl = timedelta(seconds=ttl)
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.created = 0
+        self.reused = 0
+        self.coalesced = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def key(channel_id: int, when2meet: 'When2Meet') -> str:
+        payload = json.dumps(when2meet.create_payload(), sort_keys=True)
+        return f'{channel_id}:{hashlib.sha256(payload.encode()).hexdigest()}'
+
+    async def post(self, channel: discord.TextChannel, when2meet: 'When2Meet'):
+        key = self.key(channel.id, when2meet)
+        if key in self.in_flight:
+            self.coalesced += 1
+        await single_flight(self.in_flight, key, lambda: self.publish(key, channel, when2meet))
+
+    async def publish(self, key: str, channel: discord.TextChannel, when2meet: 'When2Meet'):
+        now = datetime.utcnow()
+        async with sessionmaker.begin() as session:
+            await session.execute(delete(When2MeetEvent).where(When2MeetEvent.created_at <= now - self.ttl))
+            if (event := await session.get(When2MeetEvent, key)) is not None:
+                posted, url = event.posted, event.url
+
+        if event is not None:
+            if posted:
+                self.duplicates += 1
+                logger.info(f'The when2meet for the #{channel} channel was already posted, skipping it.')
+                return
+            self.reused += 1
+        else:
+            url = await when2meet.create_event()
+            self.created += 1
+            logger.info(f'Successfully created the when2meet for the #{channel} channel.')
+            async with sessionmaker.begin() as session:
+                session.add(When2MeetEvent(key, url, now))
+
+        await channel.send(
+            embed=when2meet.create_embed(),
+            view=when2meet.create_view(url)
+        )
+        async with sessionmaker.begin() as session:
+            if (event := await session.get(When2MeetEvent, key)) is not None:
+                event.posted = True
+        logger.info(f'Successfully sent message for the when2meet in the #{channel} channel.')
+
+
+class When2MeetJobQueue:
+    # NOTE: Creating a when2meet means a POST to a third party site, so it is
+    # done by a pool of workers instead of in the event handler. Jobs are
+    # stored in the when2meet_jobs table until their message is posted, so
+    # the jobs that were queued or running when the bot stopped are picked
+    # up again once it starts.
+    def __init__(
+        self,
+        get_channel: Callable[[int], Optional[discord.abc.GuildChannel]],
+        events: When2MeetEvents,
+        workers: int,
+        max_attempts: int,
+        backoff: float,
+        max_backoff: float
+    ):
+        self.get_channel = get_channel
+        self.events = events
+        self.worker_count = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.wake = asyncio.Event()
+        self.running: Set[int] = set()
+        self.queue: 'asyncio.Queue[When2MeetJob]' = asyncio.Queue()
+        self.workers: List[asyncio.Task] = []
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def enqueue(self, channel: discord.TextChannel, when2meet: 'When2Meet'):
+        async with sessionmaker.begin() as session:
+            session.add(When2MeetJob.from_when2meet(channel.guild.id, channel.id, when2meet))
+        self.wake.set()
+
+    def start(self):
+        if not self.workers:
+            self.workers = [asyncio.create_task(self.work()) for _ in range(self.worker_count)]
+            self.workers.append(asyncio.create_task(self.schedule()))
+            logger.info(f"Started {self.worker_count} when2meet workers.")
+
+    async def schedule(self):
+        # NOTE: Only this task reads jobs from the table, so a job can never
+        # be handed to two workers, the workers take them from the queue.
+        while True:
+            self.wake.clear()
+            try:
+                async with sessionmaker() as session:
+                    jobs = (await session.execute(
+                        select(When2MeetJob)
+                        .where(When2MeetJob.next_attempt <= datetime.utcnow(), When2MeetJob.id.not_in(self.running))
+                        .order_by(When2MeetJob.next_attempt)
+                    )).scalars().all()
+                    due = await session.scalar(
+                        select(func.min(When2MeetJob.next_attempt))
+                        .where(When2MeetJob.next_attempt > datetime.utcnow(), When2MeetJob.id.not_in(self.running))
+                    )
+            except Exception as error:
+                logger.error("Failed to read the due when2meet jobs.", exc_info=error)
+                await asyncio.sleep(self.backoff)
+                continue
+            for job in jobs:
+                self.running.add(job.id)
+                self.queue.put_nowait(job)
+            timeout = None if due is None else max(0.0, (due - datetime.utcnow()).total_seconds())
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def work(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                try:
+                    await self.run(job)
+                except Exception as error:
+                    await self.retry(job, error)
+            except Exception as error:
+                # NOTE: The job is still in the table, so the
+                # scheduler picks it up again after this.
+                logger.error(f"Failed to record the outcome of the when2meet job {job.id}.", exc_info=error)
+                await asyncio.sleep(self.backoff)
+            finally:
+                self.running.discard(job.id)
+                # NOTE: A retried job has a new due time to wait for.
+                self.wake.set()
+
+    async def run(self, job: When2MeetJob):
+        channel = self.get_channel(job.channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            logger.warning(f"Dropped the when2meet job {job.id} since its channel no longer exists.")
+        else:
+            await self.events.post(channel, job.to_when2meet())
+            self.completed += 1
+        async with sessionmaker.begin() as session:
+            await session.delete(await session.merge(job))
+
+    async def retry(self, job: When2MeetJob, error: Exception):
+        job_id, attempts = job.id, job.attempts + 1
+        async with sessionmaker.begin() as session:
+            job = await session.merge(job)
+            if attempts >= self.max_attempts:
+                await session.delete(job)
+                self.failed += 1
+                logger.error(
+                    f"Gave up on the when2meet job {job_id} for the channel with id {job.channel_id} "
+                    f"after {attempts} attempts.",
+                    exc_info=error
+                )
+                return
+            # NOTE: Exponential backoff with jitter so jobs that failed
+            # together do not all retry at the same moment.
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.5)
+            job.attempts = attempts
+            job.next_attempt = datetime.utcnow() + timedelta(seconds=delay)
+        self.retried += 1
+        logger.warning(
+            f"The when2meet job {job_id} failed on attempt {attempts}, retrying in {delay:.1f} seconds.",
+            exc_info=error
+        )
+
+from .utils import When2Meet, single_flight
@@ -0,0 +1,118 @@
+from typing import Awaitable, Callable, Deque, Dict, List, Tuple
+from collections import OrderedDict, deque
+
+import asyncio
+import discord
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RateBucket:
+    # NOTE: A token bucket that allows rate calls per period seconds,
+    # used to stay under Discord's rate limits instead of running into
+    # them and having every request behind a 429 wait and retry.
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.period)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) * self.period / self.rate)
+
+
+JoinHandler = Callable[[discord.Guild, List[discord.Member], RateBucket], Awaitable[List[discord.Member]]]
+
+
+class JoinPipeline:
+    # NOTE: Members that join are queued per guild and handed to the handler
+    # in batches by a single worker per guild. The handler returns the members
+    # it welcomed and paces itself with the guild's bucket.
+    def __init__(self, handler: JoinHandler, batch_size: int, rate: int, period: float):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.rate = rate
+        self.period = period
+        self.pending: Dict[int, 'OrderedDict[int, discord.Member]'] = {}
+        self.queued_at: Dict[Tuple[int, int], float] = {}
+        self.buckets: Dict[int, RateBucket] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.latencies: Deque[float] = deque(maxlen=1000)
+
+    def metrics(self) -> Dict[str, float]:
+        latencies = sorted(self.latencies)
+        return {
+            'queued': sum(map(len, self.pending.values())),
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'throughput': self.processed / self.busy if self.busy else 0.0,
+            'average_latency': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p95_latency': latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        }
+
+    def submit(self, member: discord.Member):
+        pending = self.pending.setdefault(member.guild.id, OrderedDict())
+        # NOTE: Members who leave are discarded from the queue,
+        # so a member who rejoins is still only handled once.
+        if member.id not in pending:
+            self.queued_at[member.guild.id, member.id] = time.monotonic()
+        pending[member.id] = member
+        if member.guild.id not in self.workers:
+            self.workers[member.guild.id] = asyncio.create_task(self.work(member.guild))
+
+    def discard(self, member: discord.Member):
+        if (pending := self.pending.get(member.guild.id)) and pending.pop(member.id, None):
+            self.queued_at.pop((member.guild.id, member.id), None)
+            self.skipped += 1
+            logger.debug(f"{member} left {member.guild} before their private channel was created.")
+
+    async def work(self, guild: discord.Guild):
+        pending = self.pending[guild.id]
+        bucket = self.buckets.setdefault(guild.id, RateBucket(self.rate, self.period))
+        try:
+            while pending:
+                batch = []
+                while pending and len(batch) < self.batch_size:
+                    member = pending.popitem(last=False)[1]
+                    if guild.get_member(member.id) is None:
+                        self.queued_at.pop((guild.id, member.id), None)
+                        self.skipped += 1
+                    else:
+                        batch.append(member)
+                if not batch:
+                    continue
+                start = time.monotonic()
+                try:
+                    welcomed = await self.handler(guild, batch, bucket)
+                except Exception as error:
+                    welcomed = []
+                    logger.error(f"Failed to handle a batch of {len(batch)} members joining {guild}.", exc_info=error)
+                end = time.monotonic()
+                self.busy += end - start
+                self.processed += len(welcomed)
+                self.failed += len(batch) - len(welcomed)
+                for member in batch:
+                    if (queued_at := self.queued_at.pop((guild.id, member.id), None)) is not None and member in welcomed:
+                        self.latencies.append(end - queued_at)
+                if pending or len(batch) == self.batch_size:
+                    logger.info(
+                        f"Welcomed {len(welcomed)} of {len(batch)} members in {guild}, "
+                        f"{len(pending)} still queued. Metrics: {self.metrics()}"
+                    )
+        finally:
+            del self.workers[guild.id]
+            del self.pending[guild.id]
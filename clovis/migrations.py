@@ -0,0 +1,119 @@
+from sqlalchemy import Column, Integer, MetaData, Table, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.engine import Connection
+from typing import Callable, List
+from .tables import PendingRename, PooledChannel, PrivateChannel, When2MeetEvent, When2MeetJob, When2MeetTemplate, mapper
+
+import asyncio
+import logging
+import pickle
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# NOTE: This is set once the migrations have finished
+# and is never cleared afterwards, every handler that
+# touches the database should wait on it.
+db_ready = asyncio.Event()
+
+schema_version = Table(
+    'schema_version',
+    MetaData(),
+    Column('version', Integer, nullable=False)
+)
+
+
+def add_private_channels_and_when2meet_templates(connection: Connection):
+    PrivateChannel.__table__.create(connection, checkfirst=True)
+    When2MeetTemplate.__table__.create(connection, checkfirst=True)
+
+
+def migrate_pickled_when2meets(connection: Connection):
+    # NOTE: Before the when2meet_templates table existed the template
+    # was pickled into the guilds.when2meet column.
+    if 'when2meet' not in {column['name'] for column in inspect(connection).get_columns('guilds')}:
+        return
+
+    rows = connection.execute(text('SELECT id, when2meet FROM guilds WHERE when2meet IS NOT NULL')).all()
+    for guild_id, pickled in rows:
+        template = When2MeetTemplate.from_when2meet(guild_id, pickle.loads(pickled))
+        connection.execute(
+            When2MeetTemplate.__table__.insert().prefix_with('OR REPLACE'),
+            {
+                column.name: getattr(template, column.name)
+                for column in When2MeetTemplate.__table__.columns
+            }
+        )
+    # NOTE: DROP COLUMN needs SQLite 3.35, older versions just
+    # clear the column which nothing reads from anymore.
+    if sqlite3.sqlite_version_info >= (3, 35):
+        connection.execute(text('ALTER TABLE guilds DROP COLUMN when2meet'))
+    else:
+        connection.execute(text('UPDATE guilds SET when2meet = NULL'))
+    logger.info(f"Migrated {len(rows)} pickled when2meet templates to the when2meet_templates table.")
+
+
+def add_guild_orphaned_column(connection: Connection):
+    if 'orphaned' in {column['name'] for column in inspect(connection).get_columns('guilds')}:
+        return
+    connection.execute(text('ALTER TABLE guilds ADD COLUMN orphaned BOOLEAN NOT NULL DEFAULT 0'))
+
+
+def add_channel_pool(connection: Connection):
+    if 'channel_pool_size' not in {column['name'] for column in inspect(connection).get_columns('guilds')}:
+        connection.execute(text('ALTER TABLE guilds ADD COLUMN channel_pool_size INTEGER NOT NULL DEFAULT 0'))
+    PooledChannel.__table__.create(connection, checkfirst=True)
+
+
+def add_pending_renames(connection: Connection):
+    PendingRename.__table__.create(connection, checkfirst=True)
+
+
+def add_when2meet_jobs(connection: Connection):
+    When2MeetJob.__table__.create(connection, checkfirst=True)
+
+
+def add_when2meet_events(connection: Connection):
+    When2MeetEvent.__table__.create(connection, checkfirst=True)
+
+
+# NOTE: Only ever append to this list, the position of
+# each migration in it is the schema version it upgrades to.
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    add_private_channels_and_when2meet_templates,
+    migrate_pickled_when2meets,
+    add_guild_orphaned_column,
+    add_channel_pool,
+    add_pending_renames,
+    add_when2meet_jobs,
+    add_when2meet_events
+]
+
+
+def upgrade(connection: Connection):
+    tables = set(inspect(connection).get_table_names())
+    if 'guilds' not in tables:
+        # NOTE: A brand new database already has the latest schema.
+        mapper.metadata.create_all(connection)
+        schema_version.create(connection)
+        connection.execute(schema_version.insert(), {'version': len(MIGRATIONS)})
+        logger.info(f"Created a new database at schema version {len(MIGRATIONS)}.")
+        return
+
+    if 'schema_version' not in tables:
+        # NOTE: Databases from before schema versioning was added.
+        schema_version.create(connection)
+        connection.execute(schema_version.insert(), {'version': 0})
+
+    version = connection.execute(select(schema_version.c.version)).scalar_one()
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(connection)
+        connection.execute(schema_version.update().values(version=number))
+        logger.info(f"Upgraded the database to schema version {number} ({migration.__name__}).")
+
+
+async def migrate(engine: AsyncEngine):
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade)
+    db_ready.set()
+    logger.info("The database is ready.")
@@ -0,0 +1,135 @@
+from typing import Callable, Dict, Optional
+from .utils import hardened_fetch_channel
+from .settings import guild_settings
+from sqlalchemy import func, select
+from .tables import PooledChannel
+from .joins import RateBucket
+from . import sessionmaker
+
+import asyncio
+import discord
+import logging
+
+logger = logging.getLogger(__name__)
+
+POOLED_CHANNEL_NAME = 'reserved'
+
+
+def hidden_overwrites(guild: discord.Guild) -> Dict[discord.Role, discord.PermissionOverwrite]:
+    return {
+        guild.default_role: discord.PermissionOverwrite.from_pair(
+            discord.Permissions.none(),
+            discord.Permissions.all()
+        )
+    }
+
+
+class ChannelPool:
+    # NOTE: Creating a channel goes through the slow, per guild rate limited
+    # channel create route. Pooled channels are created ahead of time hidden
+    # from everyone, so welcoming a member only takes a single edit to rename
+    # the channel and give the member access to it.
+    def __init__(self, bucket: Callable[[int], RateBucket], busy: Callable[[int], bool], idle_delay: float):
+        self.bucket = bucket
+        self.busy = busy
+        self.idle_delay = idle_delay
+        self.refills: Dict[int, asyncio.Task] = {}
+        self.claimed = 0
+        self.created = 0
+
+    async def claim(
+        self,
+        member: discord.Member,
+        category: discord.CategoryChannel,
+        overwrites: Dict[discord.abc.Snowflake, discord.PermissionOverwrite]
+    ) -> Optional[discord.TextChannel]:
+        guild = member.guild
+        while True:
+            async with sessionmaker.begin() as session:
+                pooled_channel = (await session.execute(
+                    select(PooledChannel).where(PooledChannel.guild_id == guild.id).limit(1)
+                )).scalar_one_or_none()
+                if pooled_channel is None:
+                    return None
+                await session.delete(pooled_channel)
+            if isinstance(channel := guild.get_channel(pooled_channel.channel_id), discord.TextChannel):
+                break
+            logger.warning(f"The pooled channel with id {pooled_channel.channel_id} in {guild} no longer exists.")
+
+        try:
+            await channel.edit(
+                name=member.display_name,
+                category=category,
+                overwrites=overwrites,
+                reason=f"Claimed the pooled channel for {member}."
+            )
+        except discord.HTTPException as error:
+            logger.error(f"Failed to claim the pooled channel #{channel} for {member}.", exc_info=error)
+            # NOTE: The channel was left untouched so it goes back into the pool.
+            async with sessionmaker.begin() as session:
+                session.add(PooledChannel(guild.id, channel.id))
+            return None
+        self.claimed += 1
+        return channel
+
+    def request_refill(self, guild: discord.Guild):
+        if guild.id not in self.refills:
+            self.refills[guild.id] = asyncio.create_task(self.refill(guild))
+
+    async def refill(self, guild: discord.Guild):
+        try:
+            async with sessionmaker.begin() as session:
+                pooled_channels = await session.execute(
+                    select(PooledChannel).where(PooledChannel.guild_id == guild.id)
+                )
+                for pooled_channel in pooled_channels.scalars():
+                    if guild.get_channel(pooled_channel.channel_id) is None:
+                        await session.delete(pooled_channel)
+
+            # NOTE: The settings are read on every step so changing
+            # the pool size or category applies to a running refill.
+            while True:
+                settings = await guild_settings.get(guild.id)
+                if (count := await self.size(guild.id)) == settings.channel_pool_size:
+                    break
+                # NOTE: The pool is only refilled while no members are being
+                # welcomed, so it never competes with them for the rate limit.
+                if self.busy(guild.id):
+                    await asyncio.sleep(self.idle_delay)
+                    continue
+                await self.bucket(guild.id).acquire()
+                if count < settings.channel_pool_size:
+                    category = await hardened_fetch_channel(settings.create_category_id, guild, None)
+                    if category is None:
+                        logger.warning(f"Stopped refilling the private channel pool in {guild} since it has no category.")
+                        break
+                    channel = await guild.create_text_channel(
+                        POOLED_CHANNEL_NAME,
+                        category=category,
+                        overwrites=hidden_overwrites(guild),
+                        reason='Refilling the private channel pool.'
+                    )
+                    async with sessionmaker.begin() as session:
+                        session.add(PooledChannel(guild.id, channel.id))
+                    self.created += 1
+                else:
+                    async with sessionmaker.begin() as session:
+                        pooled_channel = (await session.execute(
+                            select(PooledChannel).where(PooledChannel.guild_id == guild.id).limit(1)
+                        )).scalar_one_or_none()
+                        if pooled_channel is None:
+                            break
+                        await session.delete(pooled_channel)
+                    if (channel := guild.get_channel(pooled_channel.channel_id)):
+                        await channel.delete(reason='Shrinking the private channel pool.')
+            logger.info(f"The private channel pool in {guild} has {count} channels.")
+        except Exception as error:
+            logger.error(f"Failed to refill the private channel pool in {guild}.", exc_info=error)
+        finally:
+            del self.refills[guild.id]
+
+    async def size(self, guild_id: int) -> int:
+        async with sessionmaker() as session:
+            return await session.scalar(
+                select(func.count()).select_from(PooledChannel).where(PooledChannel.guild_id == guild_id)
+            )
@@ -0,0 +1,73 @@
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.engine import Row
+from sqlalchemy import bindparam, select
+from dataclasses import fields, MISSING
+from typing import Dict, Iterable, List, Optional
+from .tables import Guild
+
+# NOTE: A thin Core layer for the hot paths that only need a guild's
+# columns, it skips the session, identity map and dataclass mapping.
+# The statements are built once here so SQLAlchemy's compiled cache
+# compiles them once per engine and every call only binds guild_id.
+guilds = Guild.__table__
+
+# NOTE: The defaults live on the dataclass fields rather than
+# the columns, so they are passed explicitly to Core inserts.
+guild_defaults = {
+    field.name: field.default
+    for field in fields(Guild)
+    if field.name != 'id' and field.default is not MISSING
+}
+
+select_guild = select(*guilds.c).where(guilds.c.id == bindparam('guild_id'))
+
+select_guilds = select(*guilds.c)
+
+insert_guild = (
+    insert(guilds)
+    .values({
+        **guild_defaults,
+        'id': bindparam('guild_id'),
+        'last_message_id': bindparam('guild_last_message_id', None)
+    })
+    .on_conflict_do_nothing(index_elements=[guilds.c.id])
+)
+
+update_orphaned = (
+    guilds.update()
+    .where(guilds.c.id == bindparam('guild_id'))
+    .values(orphaned=bindparam('guild_orphaned'))
+)
+
+
+async def get_guild(connection: AsyncConnection, guild_id: int) -> Optional[Row]:
+    return (await connection.execute(select_guild, {'guild_id': guild_id})).first()
+
+
+async def get_or_create_guild(connection: AsyncConnection, guild_id: int) -> Row:
+    # NOTE: Existing guilds only cost a select. Otherwise the insert ignores
+    # a row created concurrently instead of failing on the primary key, and
+    # since SQLAlchemy 1.4 does not support RETURNING on SQLite the row is
+    # read back with a second select on the same connection.
+    if (row := await get_guild(connection, guild_id)) is not None:
+        return row
+    await connection.execute(insert_guild, {'guild_id': guild_id})
+    return await get_guild(connection, guild_id)
+
+
+async def get_guilds(connection: AsyncConnection) -> List[Row]:
+    return (await connection.execute(select_guilds)).all()
+
+
+async def insert_guilds(connection: AsyncConnection, last_message_ids: Dict[int, Optional[int]]):
+    if last_message_ids:
+        await connection.execute(insert_guild, [
+            {'guild_id': guild_id, 'guild_last_message_id': last_message_id}
+            for guild_id, last_message_id in last_message_ids.items()
+        ])
+
+
+async def set_orphaned(connection: AsyncConnection, guild_ids: Iterable[int], orphaned: bool):
+    if (rows := [{'guild_id': guild_id, 'guild_orphaned': orphaned} for guild_id in guild_ids]):
+        await connection.execute(update_orphaned, rows)
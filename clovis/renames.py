@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Optional
+from .tables import PendingRename
+from collections import deque
+from sqlalchemy import select
+from . import sessionmaker
+
+import asyncio
+import discord
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def channel_name(name: str) -> str:
+    # NOTE: Roughly how Discord normalizes text channel names, used to
+    # skip renames that would not change the name of the channel.
+    return re.sub(r'\s+', '-', name.strip().lower())
+
+
+class RenameScheduler:
+    # NOTE: Discord only allows a channel to be renamed about twice every
+    # ten minutes, anything past that waits in a 429 backoff. Renames are
+    # held until the name has not changed for the quiet window so only the
+    # latest name is ever sent, and they are spaced out to stay in budget.
+    BUDGET = 2
+    WINDOW = 600
+
+    def __init__(self, quiet: float):
+        self.quiet = quiet
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.history: Dict[int, Deque[float]] = {}
+        self.renamed = 0
+        self.coalesced = 0
+        self.skipped = 0
+
+    async def schedule(self, guild: discord.Guild, channel_id: int, name: str):
+        due = datetime.utcnow() + timedelta(seconds=self.quiet)
+        async with sessionmaker.begin() as session:
+            if await session.get(PendingRename, channel_id):
+                self.coalesced += 1
+            await session.merge(PendingRename(channel_id, guild.id, name, due))
+        self.start(guild, channel_id)
+
+    def start(self, guild: discord.Guild, channel_id: int):
+        if channel_id not in self.tasks:
+            self.tasks[channel_id] = asyncio.create_task(self.run(guild, channel_id))
+
+    async def cancel(self, channel_id: int):
+        if (task := self.tasks.get(channel_id)):
+            task.cancel()
+        async with sessionmaker.begin() as session:
+            if (pending_rename := await session.get(PendingRename, channel_id)):
+                await session.delete(pending_rename)
+
+    async def restore(self, guild: discord.Guild):
+        async with sessionmaker() as session:
+            pending_renames = await session.execute(
+                select(PendingRename.channel_id).where(PendingRename.guild_id == guild.id)
+            )
+            channel_ids = pending_renames.scalars().all()
+        for channel_id in channel_ids:
+            self.start(guild, channel_id)
+        if channel_ids:
+            logger.info(f"Restored {len(channel_ids)} pending channel renames in {guild}.")
+
+    def budget_wait(self, channel_id: int) -> float:
+        history = self.history.setdefault(channel_id, deque(maxlen=self.BUDGET))
+        if len(history) < self.BUDGET:
+            return 0.0
+        return max(0.0, history[0] + self.WINDOW - time.monotonic())
+
+    async def pending(self, channel_id: int) -> Optional[PendingRename]:
+        async with sessionmaker() as session:
+            return await session.get(PendingRename, channel_id)
+
+    async def run(self, guild: discord.Guild, channel_id: int):
+        try:
+            while (pending_rename := await self.pending(channel_id)) is not None:
+                # NOTE: Every new name pushes the due time back,
+                # so the wait starts over until it stops changing.
+                wait = max(
+                    (pending_rename.due - datetime.utcnow()).total_seconds(),
+                    self.budget_wait(channel_id)
+                )
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+
+                channel = guild.get_channel(channel_id)
+                if channel is None:
+                    logger.warning(f"Dropped the pending rename of the channel with id {channel_id} since it no longer exists.")
+                elif channel.name == channel_name(pending_rename.name):
+                    self.skipped += 1
+                else:
+                    await channel.edit(
+                        name=pending_rename.name,
+                        reason="Updating channel to the user's real name (as inferred from their nickname)."
+                    )
+                    self.history[channel_id].append(time.monotonic())
+                    self.renamed += 1
+                    logger.info(f"Successfully renamed the #{channel} private channel to {pending_rename.name!r}.")
+
+                async with sessionmaker.begin() as session:
+                    # NOTE: Only delete the row if no newer name came in during the edit.
+                    if (current := await session.get(PendingRename, channel_id)) and current.due == pending_rename.due:
+                        await session.delete(current)
+        except Exception as error:
+            logger.error(f"Failed to rename the channel with id {channel_id}.", exc_info=error)
+        finally:
+            del self.tasks[channel_id]
@@ -0,0 +1,216 @@
+from typing import Any, AsyncIterator, Dict, Tuple, Union
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from sqlalchemy.engine import Row
+from sqlalchemy import bindparam
+from . import sessionmaker, engine, config
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class GuildSettings:
+    __slots__ = (
+        'id',
+        'create_category_id',
+        'when2meet_category_id',
+        'welcome_message',
+        'welcome_channel_id',
+        'last_message_id',
+        'create_channel',
+        'message_error',
+        'message_missing_welcome_channel',
+        'channel_pool_size'
+    )
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            object.__setattr__(self, name, kwargs[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable, use GuildSettingsCache.edit() to change it.')
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    @classmethod
+    def from_guild(cls, guild: Union['Guild', Row]) -> 'GuildSettings':
+        return cls(**{name: getattr(guild, name) for name in cls.__slots__})
+
+    def replace(self, **changes) -> 'GuildSettings':
+        return type(self)(**{name: changes.get(name, getattr(self, name)) for name in self.__slots__})
+
+    @property
+    def listen(self):
+        return self.create_category_id and self.create_channel
+
+    @property
+    def mention_welcome(self):
+        return f'<#{self.welcome_channel_id}>'
+
+
+class GuildSettingsCache:
+    def __init__(self, maxsize: int, ttl: float, flush_interval: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.entries: 'OrderedDict[int, Tuple[float, GuildSettings]]' = OrderedDict()
+        self.loading: Dict[int, asyncio.Future] = {}
+        # NOTE: Changes made with update() that have not been written
+        # to the database yet, keyed by guild id and then column name.
+        self.pending: Dict[int, Dict[str, Any]] = {}
+        # NOTE: Changes taken out of pending by a flush that has not
+        # committed yet, reads still have to see them until it does.
+        self.flushing: Dict[int, Dict[str, Any]] = {}
+        self.flush_lock = asyncio.Lock()
+        self.pending_changed = asyncio.Event()
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.flushed_updates = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def put(self, settings: GuildSettings) -> GuildSettings:
+        # NOTE: Snapshots loaded from the database do not have the pending
+        # changes yet, so they are layered on top to keep reads consistent.
+        if (changes := {**self.flushing.get(settings.id, {}), **self.pending.get(settings.id, {})}):
+            settings = settings.replace(**changes)
+        self.entries[settings.id] = (time.monotonic() + self.ttl, settings)
+        self.entries.move_to_end(settings.id)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return settings
+
+    def invalidate(self, guild_id: int):
+        self.entries.pop(guild_id, None)
+
+    async def get(self, guild_id: int) -> GuildSettings:
+        if (entry := self.entries.get(guild_id)) is not None:
+            expires, settings = entry
+            if expires > time.monotonic():
+                self.hits += 1
+                self.entries.move_to_end(guild_id)
+                return settings
+            del self.entries[guild_id]
+
+        # NOTE: Concurrent misses for the same guild share one load,
+        # otherwise they could both try to insert a new guild row.
+        return await single_flight(self.loading, guild_id, lambda: self.load(guild_id))
+
+    async def load(self, guild_id: int) -> GuildSettings:
+        self.misses += 1
+        # NOTE: A flush can commit these while the row is being read, and once
+        # it has they are no longer pending for put() to layer on top.
+        changes = {**self.flushing.get(guild_id, {}), **self.pending.get(guild_id, {})}
+        async with engine.begin() as connection:
+            row = await queries.get_or_create_guild(connection, guild_id)
+        settings = GuildSettings.from_guild(row).replace(**changes)
+        # NOTE: If the guild was edited while loading then
+        # the snapshot from the edit is the newer one.
+        if (entry := self.entries.get(guild_id)) is not None:
+            settings = entry[1]
+        else:
+            settings = self.put(settings)
+        logger.debug(
+            f"Loaded the settings for the guild with id {guild_id} into the cache. "
+            f"Cache hits: {self.hits}, misses: {self.misses} ({self.hit_rate:.1%} hit rate)."
+        )
+        return settings
+
+    @asynccontextmanager
+    async def edit(self, guild_id: int) -> AsyncIterator['Guild']:
+        # NOTE: The snapshot has to be taken before the transaction
+        # commits since the ORM expires the object on commit, and
+        # it is only cached once the commit has succeeded.
+        # NOTE: Waits for a running flush so the row is read after it has
+        # committed, and keeps the next one from overwriting this edit.
+        async with self.flush_lock:
+            changes = self.pending.pop(guild_id, {})
+            try:
+                async with sessionmaker.begin() as session:
+                    sql_guild = await Guild.get_or_create(session, guild_id)
+                    # NOTE: Pending changes are written as part of this transaction.
+                    for name, value in changes.items():
+                        setattr(sql_guild, name, value)
+                    yield sql_guild
+                    settings = GuildSettings.from_guild(sql_guild)
+            except BaseException:
+                self.restore(guild_id, changes)
+                raise
+            self.put(settings)
+
+    def restore(self, guild_id: int, changes: Dict[str, Any]):
+        # NOTE: Changes made after these were taken are newer and win.
+        if changes:
+            self.pending[guild_id] = {**changes, **self.pending.get(guild_id, {})}
+            self.pending_changed.set()
+
+    async def update(self, guild_id: int, **changes):
+        for name in changes:
+            if name not in GuildSettings.__slots__ or name == 'id':
+                raise AttributeError(f'{name} is not a guild setting that can be updated.')
+        # NOTE: Makes sure the guild row exists before the change is flushed.
+        settings = await self.get(guild_id)
+        self.pending.setdefault(guild_id, {}).update(changes)
+        self.put(settings)
+        self.pending_changed.set()
+
+    async def flush(self):
+        async with self.flush_lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, {}
+            self.flushing = pending
+            # NOTE: Guilds changing the same columns are written with a single executemany.
+            batches = defaultdict(list)
+            for guild_id, changes in pending.items():
+                batches[tuple(sorted(changes))].append(
+                    {'guild_id': guild_id, **{f'new_{name}': value for name, value in changes.items()}}
+                )
+            try:
+                async with sessionmaker.begin() as session:
+                    for names, rows in batches.items():
+                        await session.execute(
+                            Guild.__table__.update()
+                            .where(Guild.__table__.c.id == bindparam('guild_id'))
+                            .values({name: bindparam(f'new_{name}') for name in names}),
+                            rows
+                        )
+            except BaseException:
+                for guild_id, changes in pending.items():
+                    self.restore(guild_id, changes)
+                raise
+            finally:
+                self.flushing = {}
+        self.flushes += 1
+        self.flushed_updates += len(pending)
+        logger.debug(
+            f"Flushed the pending settings of {len(pending)} guilds in {len(batches)} statements. "
+            f"Flushes: {self.flushes}, guild updates: {self.flushed_updates}."
+        )
+
+    async def run(self):
+        while True:
+            await self.pending_changed.wait()
+            # NOTE: Waiting after the first change lets the
+            # changes that follow it share the same transaction.
+            await asyncio.sleep(self.flush_interval)
+            self.pending_changed.clear()
+            try:
+                await self.flush()
+            except Exception as error:
+                logger.error('Failed to flush the pending guild settings.', exc_info=error)
+
+
+guild_settings = GuildSettingsCache(config.guild_cache_size, config.guild_cache_ttl, config.settings_flush_interval)
+
+from .utils import single_flight
+from . import queries
+from .tables import Guild
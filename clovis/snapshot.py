@@ -0,0 +1,94 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy import event
+from typing import Optional
+from pathlib import Path
+
+import asyncio
+import aiosqlite
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshotter:
+    # NOTE: The in-memory database only has a single connection, so checking
+    # it out of the pool waits for every running transaction to finish and
+    # the backup always sees a consistent database.
+    def __init__(self, engine: AsyncEngine, path: Path, interval: float, max_writes: int, max_loss: float):
+        self.engine = engine
+        self.path = path
+        self.interval = interval
+        self.max_writes = max_writes
+        self.max_loss = max_loss
+        self.writes = 0
+        # NOTE: When the oldest write that has not been saved yet happened.
+        self.dirty_since: Optional[float] = None
+        self.wake = asyncio.Event()
+        self.saves = 0
+        event.listen(engine.sync_engine, 'after_cursor_execute', self.record_write)
+
+    def record_write(self, connection, cursor, statement, parameters, context, executemany):
+        # NOTE: Checked on the statement itself so writes made with text() are counted too.
+        if statement.lstrip()[:6].upper() in ('SELECT', 'PRAGMA'):
+            return
+        self.writes += 1
+        if self.dirty_since is None:
+            self.dirty_since = time.monotonic()
+        if self.writes >= self.max_writes:
+            self.wake.set()
+
+    async def backup(self, source_is_disk: bool):
+        async with self.engine.connect() as connection:
+            memory = (await connection.get_raw_connection()).driver_connection
+            async with aiosqlite.connect(self.path) as disk:
+                if source_is_disk:
+                    await disk.backup(memory)
+                else:
+                    await memory.backup(disk)
+
+    async def load(self):
+        if not self.path.exists():
+            logger.info(f"{self.path} does not exist, starting with an empty in-memory database.")
+            return
+        start = time.perf_counter()
+        await self.backup(source_is_disk=True)
+        logger.info(f"Loaded {self.path} into memory in {time.perf_counter() - start:.3f} seconds.")
+
+    async def save(self):
+        if self.dirty_since is None:
+            return
+        writes, dirty_since = self.writes, self.dirty_since
+        self.writes, self.dirty_since = 0, None
+        start = time.perf_counter()
+        try:
+            await self.backup(source_is_disk=False)
+        except Exception:
+            # NOTE: Keep the writes pending so the next save tries again.
+            self.writes += writes
+            self.dirty_since = dirty_since
+            raise
+        self.saves += 1
+        logger.debug(
+            f"Saved {writes} writes to {self.path} in {time.perf_counter() - start:.3f} seconds, "
+            f"the oldest was {time.monotonic() - dirty_since:.1f} seconds old."
+        )
+
+    def timeout(self) -> float:
+        if self.dirty_since is None:
+            return self.interval
+        deadline = self.dirty_since + self.max_loss - time.monotonic()
+        return max(0.0, min(self.interval, deadline))
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wake.wait(), self.timeout())
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            try:
+                await self.save()
+            except Exception as error:
+                logger.error(f"Failed to save the in-memory database to {self.path}.", exc_info=error)
+                await asyncio.sleep(self.interval)
@@ -0,0 +1,81 @@
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    busy_timeout: Optional[int] = None
+    mmap_size: Optional[int] = None
+    cache_size: Optional[int] = None
+    # NOTE: aiosqlite runs every connection in its own thread,
+    # so the pool size is also the number of database threads.
+    # None keeps SQLAlchemy's default of opening a new
+    # connection (and thread) for every session.
+    pool_size: Optional[int] = None
+    max_overflow: int = 0
+
+    def pragmas(self):
+        # NOTE: Foreign keys are disabled by default and have to be
+        # enabled on each connection for ON DELETE CASCADE to work.
+        yield 'foreign_keys', 'ON'
+        for name in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size'):
+            if (value := getattr(self, name)) is not None:
+                yield name, value
+
+
+profiles = {
+    # NOTE: SQLite's defaults, this is how the bot ran before storage profiles existed.
+    'legacy': StorageProfile(),
+    'wal': StorageProfile(
+        journal_mode='WAL',
+        synchronous='NORMAL',
+        busy_timeout=5000,
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-16000,
+        pool_size=4,
+        max_overflow=4
+    ),
+    # NOTE: Same as wal except every commit is synced to disk,
+    # so a power loss cannot roll back committed transactions.
+    'durable': StorageProfile(
+        journal_mode='WAL',
+        synchronous='FULL',
+        busy_timeout=5000,
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-16000,
+        pool_size=4,
+        max_overflow=4
+    )
+}
+
+
+def apply_profile(engine: AsyncEngine, profile: StorageProfile):
+    @event.listens_for(engine.sync_engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in profile.pragmas():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def create_engine(database: str, profile: StorageProfile) -> AsyncEngine:
+    kwargs = {}
+    if database == ':memory:':
+        # NOTE: Every connection to :memory: opens a separate empty
+        # database, so the pool holds exactly one connection and
+        # sessions wait for it instead of sharing it concurrently.
+        kwargs.update(poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0)
+    elif profile.pool_size is not None:
+        kwargs.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow
+        )
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database}", **kwargs)
+    apply_profile(engine, profile)
+    return engine
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, BigInteger, Boolean, String, PickleType
+from sqlalchemy import Column, BigInteger, Boolean, DateTime, Integer, String, JSON, ForeignKey, delete, false
 from sqlalchemy.ext.mutable import MutableDict, MutableList
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.decl_api import registry
 from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List
 
 mapper = registry()
 
@@ -25,13 +27,17 @@ class Guild:
     )
     create_category_id: int = field(default=None, metadata={'sa': Column(BigInteger)})
     when2meet_category_id: int = field(default=None, metadata={'sa': Column(BigInteger)})
-    when2meet: 'When2Meet' = field(default=None, metadata={'sa': Column(PickleType)})
     welcome_message: str = field(default=default_message, metadata={'sa': Column(String(4000))})
     welcome_channel_id: int = field(default=None, metadata={'sa': Column(BigInteger)})
     last_message_id: int = field(default=None, metadata={'sa': Column(BigInteger)})
     create_channel: bool = field(default=True, metadata={'sa': Column(Boolean, nullable=False)})
     message_error: bool = field(default=True, metadata={'sa': Column(Boolean, nullable=False)})
     message_missing_welcome_channel: bool = field(default=True, metadata={'sa': Column(Boolean, nullable=False)})
+    # NOTE: How many hidden channels to keep ready for members who join, 0 disables the pool.
+    channel_pool_size: int = field(default=0, metadata={'sa': Column(Integer, nullable=False, server_default='0')})
+    # NOTE: Set when the bot is no longer in the guild, the row is kept
+    # so the settings are still there if the bot is invited back.
+    orphaned: bool = field(default=False, metadata={'sa': Column(Boolean, nullable=False, server_default=false())})
 
     @property
     def listen(self):
@@ -49,4 +55,144 @@ class Guild:
         session.add(guild)
         return guild
 
+
+@mapper.mapped
+@dataclass
+class PrivateChannel:
+    __tablename__ = 'private_channels'
+
+    __sa_dataclass_metadata_key__ = 'sa'
+
+    guild_id: int = field(metadata={
+        'sa': Column(BigInteger, ForeignKey('guilds.id', ondelete='CASCADE'), primary_key=True)
+        }
+    )
+    member_id: int = field(metadata={'sa': Column(BigInteger, primary_key=True)})
+    channel_id: int = field(metadata={'sa': Column(BigInteger, nullable=False, unique=True)})
+
+    @classmethod
+    async def remove(cls, session: AsyncSession, channel_id: int):
+        await session.execute(delete(cls).where(cls.channel_id == channel_id))
+
+@mapper.mapped
+@dataclass
+class PooledChannel:
+    __tablename__ = 'pooled_channels'
+
+    __sa_dataclass_metadata_key__ = 'sa'
+
+    guild_id: int = field(metadata={
+        'sa': Column(BigInteger, ForeignKey('guilds.id', ondelete='CASCADE'), nullable=False, index=True)
+        }
+    )
+    channel_id: int = field(metadata={'sa': Column(BigInteger, primary_key=True)})
+
+    @classmethod
+    async def remove(cls, session: AsyncSession, channel_id: int):
+        await session.execute(delete(cls).where(cls.channel_id == channel_id))
+
+@mapper.mapped
+@dataclass
+class PendingRename:
+    __tablename__ = 'pending_renames'
+
+    __sa_dataclass_metadata_key__ = 'sa'
+
+    channel_id: int = field(metadata={'sa': Column(BigInteger, primary_key=True)})
+    guild_id: int = field(metadata={
+        'sa': Column(BigInteger, ForeignKey('guilds.id', ondelete='CASCADE'), nullable=False)
+        }
+    )
+    name: str = field(metadata={'sa': Column(String(100), nullable=False)})
+    # NOTE: In UTC, the rename is not attempted before this.
+    due: datetime = field(metadata={'sa': Column(DateTime, nullable=False)})
+
+@dataclass
+class When2MeetFields:
+    # NOTE: The columns needed to recreate a when2meet, shared by the
+    # guild templates and the queued jobs so they are stored the same way.
+    __sa_dataclass_metadata_key__ = 'sa'
+
+    event_name: str = field(metadata={'sa': Column(String(4000), nullable=False)})
+    no_earlier_than: int = field(metadata={'sa': Column(Integer, nullable=False)})
+    no_later_than: int = field(metadata={'sa': Column(Integer, nullable=False)})
+    timezone: str = field(metadata={'sa': Column(String(64), nullable=False)})
+    possible_dates: List[str] = field(metadata={'sa': Column(JSON, nullable=False)})
+
+    @staticmethod
+    def when2meet_fields(when2meet: 'When2Meet') -> Dict[str, Any]:
+        return dict(
+            event_name=when2meet.event_name,
+            no_earlier_than=when2meet.no_earlier_than,
+            no_later_than=when2meet.no_later_than,
+            timezone=when2meet.timezone,
+            possible_dates=[date.isoformat() for date in when2meet.possible_dates]
+        )
+
+    def to_when2meet(self) -> 'When2Meet':
+        return When2Meet(
+            self.event_name,
+            self.no_earlier_than,
+            self.no_later_than,
+            self.timezone,
+            [datetime.fromisoformat(date) for date in self.possible_dates]
+        )
+
+@mapper.mapped
+@dataclass
+class When2MeetTemplate(When2MeetFields):
+    __tablename__ = 'when2meet_templates'
+
+    __sa_dataclass_metadata_key__ = 'sa'
+
+    guild_id: int = field(metadata={
+        'sa': Column(BigInteger, ForeignKey('guilds.id', ondelete='CASCADE'), primary_key=True)
+        }
+    )
+
+    @classmethod
+    def from_when2meet(cls, guild_id: int, when2meet: 'When2Meet') -> 'When2MeetTemplate':
+        return cls(guild_id=guild_id, **cls.when2meet_fields(when2meet))
+
+@mapper.mapped
+@dataclass
+class When2MeetJob(When2MeetFields):
+    __tablename__ = 'when2meet_jobs'
+
+    __sa_dataclass_metadata_key__ = 'sa'
+
+    guild_id: int = field(metadata={
+        'sa': Column(BigInteger, ForeignKey('guilds.id', ondelete='CASCADE'), nullable=False)
+        }
+    )
+    channel_id: int = field(metadata={'sa': Column(BigInteger, nullable=False)})
+    # NOTE: In UTC, the job is not attempted before this.
+    next_attempt: datetime = field(metadata={'sa': Column(DateTime, nullable=False, index=True)})
+    attempts: int = field(default=0, metadata={'sa': Column(Integer, nullable=False)})
+    id: int = field(default=None, metadata={'sa': Column(Integer, primary_key=True)})
+
+    @classmethod
+    def from_when2meet(cls, guild_id: int, channel_id: int, when2meet: 'When2Meet') -> 'When2MeetJob':
+        return cls(
+            guild_id=guild_id,
+            channel_id=channel_id,
+            next_attempt=datetime.utcnow(),
+            **cls.when2meet_fields(when2meet)
+        )
+
+
+@mapper.mapped
+@dataclass
+class When2MeetEvent:
+    __tablename__ = 'when2meet_events'
+
+    __sa_dataclass_metadata_key__ = 'sa'
+
+    # NOTE: The channel id and a hash of the payload the event was created with.
+    key: str = field(metadata={'sa': Column(String(96), primary_key=True)})
+    url: str = field(metadata={'sa': Column(String(256), nullable=False)})
+    # NOTE: In UTC.
+    created_at: datetime = field(metadata={'sa': Column(DateTime, nullable=False, index=True)})
+    posted: bool = field(default=False, metadata={'sa': Column(Boolean, nullable=False)})
+
 from .utils import When2Meet
@@ -0,0 +1,440 @@
+# NOTE: This file is generated by create_timezones.py, do not edit it by hand.
+# Each entry is (key, name, timezone) where key is the normalized city name,
+# name is the display name and timezone is the canonical IANA timezone.
+# Generated from pytz 2026.5.
+
+TIMEZONES = (
+    ('abidjan', 'Abidjan', 'Africa/Abidjan'),
+    ('accra', 'Accra', 'Africa/Accra'),
+    ('adak', 'Adak', 'America/Adak'),
+    ('addis ababa', 'Addis Ababa', 'Africa/Addis_Ababa'),
+    ('adelaide', 'Adelaide', 'Australia/Adelaide'),
+    ('aden', 'Aden', 'Asia/Aden'),
+    ('alaska', 'Alaska', 'US/Alaska'),
+    ('algiers', 'Algiers', 'Africa/Algiers'),
+    ('almaty', 'Almaty', 'Asia/Almaty'),
+    ('amman', 'Amman', 'Asia/Amman'),
+    ('amsterdam', 'Amsterdam', 'Europe/Amsterdam'),
+    ('anadyr', 'Anadyr', 'Asia/Anadyr'),
+    ('anchorage', 'Anchorage', 'America/Anchorage'),
+    ('andorra', 'Andorra', 'Europe/Andorra'),
+    ('anguilla', 'Anguilla', 'America/Anguilla'),
+    ('antananarivo', 'Antananarivo', 'Indian/Antananarivo'),
+    ('antigua', 'Antigua', 'America/Antigua'),
+    ('apia', 'Apia', 'Pacific/Apia'),
+    ('aqtau', 'Aqtau', 'Asia/Aqtau'),
+    ('aqtobe', 'Aqtobe', 'Asia/Aqtobe'),
+    ('araguaina', 'Araguaina', 'America/Araguaina'),
+    ('arizona', 'Arizona', 'US/Arizona'),
+    ('aruba', 'Aruba', 'America/Aruba'),
+    ('ashgabat', 'Ashgabat', 'Asia/Ashgabat'),
+    ('asmara', 'Asmara', 'Africa/Asmara'),
+    ('astrakhan', 'Astrakhan', 'Europe/Astrakhan'),
+    ('asuncion', 'Asuncion', 'America/Asuncion'),
+    ('athens', 'Athens', 'Europe/Athens'),
+    ('atikokan', 'Atikokan', 'America/Atikokan'),
+    ('atlantic', 'Atlantic', 'Canada/Atlantic'),
+    ('atyrau', 'Atyrau', 'Asia/Atyrau'),
+    ('auckland', 'Auckland', 'Pacific/Auckland'),
+    ('azores', 'Azores', 'Atlantic/Azores'),
+    ('baghdad', 'Baghdad', 'Asia/Baghdad'),
+    ('bahia', 'Bahia', 'America/Bahia'),
+    ('bahia banderas', 'Bahia Banderas', 'America/Bahia_Banderas'),
+    ('bahrain', 'Bahrain', 'Asia/Bahrain'),
+    ('baku', 'Baku', 'Asia/Baku'),
+    ('bamako', 'Bamako', 'Africa/Bamako'),
+    ('bangkok', 'Bangkok', 'Asia/Bangkok'),
+    ('bangui', 'Bangui', 'Africa/Bangui'),
+    ('banjul', 'Banjul', 'Africa/Banjul'),
+    ('barbados', 'Barbados', 'America/Barbados'),
+    ('barnaul', 'Barnaul', 'Asia/Barnaul'),
+    ('beirut', 'Beirut', 'Asia/Beirut'),
+    ('belem', 'Belem', 'America/Belem'),
+    ('belgrade', 'Belgrade', 'Europe/Belgrade'),
+    ('belize', 'Belize', 'America/Belize'),
+    ('berlin', 'Berlin', 'Europe/Berlin'),
+    ('bermuda', 'Bermuda', 'Atlantic/Bermuda'),
+    ('beulah', 'Beulah', 'America/North_Dakota/Beulah'),
+    ('bishkek', 'Bishkek', 'Asia/Bishkek'),
+    ('bissau', 'Bissau', 'Africa/Bissau'),
+    ('blanc-sablon', 'Blanc-Sablon', 'America/Blanc-Sablon'),
+    ('blantyre', 'Blantyre', 'Africa/Blantyre'),
+    ('boa vista', 'Boa Vista', 'America/Boa_Vista'),
+    ('bogota', 'Bogota', 'America/Bogota'),
+    ('boise', 'Boise', 'America/Boise'),
+    ('bougainville', 'Bougainville', 'Pacific/Bougainville'),
+    ('bratislava', 'Bratislava', 'Europe/Bratislava'),
+    ('brazzaville', 'Brazzaville', 'Africa/Brazzaville'),
+    ('brisbane', 'Brisbane', 'Australia/Brisbane'),
+    ('broken hill', 'Broken Hill', 'Australia/Broken_Hill'),
+    ('brunei', 'Brunei', 'Asia/Brunei'),
+    ('brussels', 'Brussels', 'Europe/Brussels'),
+    ('bucharest', 'Bucharest', 'Europe/Bucharest'),
+    ('budapest', 'Budapest', 'Europe/Budapest'),
+    ('buenos aires', 'Buenos Aires', 'America/Argentina/Buenos_Aires'),
+    ('bujumbura', 'Bujumbura', 'Africa/Bujumbura'),
+    ('busingen', 'Busingen', 'Europe/Busingen'),
+    ('cairo', 'Cairo', 'Africa/Cairo'),
+    ('cambridge bay', 'Cambridge Bay', 'America/Cambridge_Bay'),
+    ('campo grande', 'Campo Grande', 'America/Campo_Grande'),
+    ('canary', 'Canary', 'Atlantic/Canary'),
+    ('cancun', 'Cancun', 'America/Cancun'),
+    ('cape verde', 'Cape Verde', 'Atlantic/Cape_Verde'),
+    ('caracas', 'Caracas', 'America/Caracas'),
+    ('casablanca', 'Casablanca', 'Africa/Casablanca'),
+    ('casey', 'Casey', 'Antarctica/Casey'),
+    ('catamarca', 'Catamarca', 'America/Argentina/Catamarca'),
+    ('cayenne', 'Cayenne', 'America/Cayenne'),
+    ('cayman', 'Cayman', 'America/Cayman'),
+    ('center', 'Center', 'America/North_Dakota/Center'),
+    ('central', 'Central', 'Canada/Central'),
+    ('central', 'Central', 'US/Central'),
+    ('ceuta', 'Ceuta', 'Africa/Ceuta'),
+    ('chagos', 'Chagos', 'Indian/Chagos'),
+    ('chatham', 'Chatham', 'Pacific/Chatham'),
+    ('chicago', 'Chicago', 'America/Chicago'),
+    ('chihuahua', 'Chihuahua', 'America/Chihuahua'),
+    ('chisinau', 'Chisinau', 'Europe/Chisinau'),
+    ('chita', 'Chita', 'Asia/Chita'),
+    ('christmas', 'Christmas', 'Indian/Christmas'),
+    ('chuuk', 'Chuuk', 'Pacific/Chuuk'),
+    ('ciudad juarez', 'Ciudad Juarez', 'America/Ciudad_Juarez'),
+    ('cocos', 'Cocos', 'Indian/Cocos'),
+    ('colombo', 'Colombo', 'Asia/Colombo'),
+    ('comoro', 'Comoro', 'Indian/Comoro'),
+    ('conakry', 'Conakry', 'Africa/Conakry'),
+    ('copenhagen', 'Copenhagen', 'Europe/Copenhagen'),
+    ('cordoba', 'Cordoba', 'America/Argentina/Cordoba'),
+    ('costa rica', 'Costa Rica', 'America/Costa_Rica'),
+    ('coyhaique', 'Coyhaique', 'America/Coyhaique'),
+    ('creston', 'Creston', 'America/Creston'),
+    ('cuiaba', 'Cuiaba', 'America/Cuiaba'),
+    ('curacao', 'Curacao', 'America/Curacao'),
+    ('dakar', 'Dakar', 'Africa/Dakar'),
+    ('damascus', 'Damascus', 'Asia/Damascus'),
+    ('danmarkshavn', 'Danmarkshavn', 'America/Danmarkshavn'),
+    ('dar es salaam', 'Dar es Salaam', 'Africa/Dar_es_Salaam'),
+    ('darwin', 'Darwin', 'Australia/Darwin'),
+    ('davis', 'Davis', 'Antarctica/Davis'),
+    ('dawson', 'Dawson', 'America/Dawson'),
+    ('dawson creek', 'Dawson Creek', 'America/Dawson_Creek'),
+    ('denver', 'Denver', 'America/Denver'),
+    ('detroit', 'Detroit', 'America/Detroit'),
+    ('dhaka', 'Dhaka', 'Asia/Dhaka'),
+    ('dili', 'Dili', 'Asia/Dili'),
+    ('djibouti', 'Djibouti', 'Africa/Djibouti'),
+    ('dominica', 'Dominica', 'America/Dominica'),
+    ('douala', 'Douala', 'Africa/Douala'),
+    ('dubai', 'Dubai', 'Asia/Dubai'),
+    ('dublin', 'Dublin', 'Europe/Dublin'),
+    ('dumontdurville', 'DumontDUrville', 'Antarctica/DumontDUrville'),
+    ('dushanbe', 'Dushanbe', 'Asia/Dushanbe'),
+    ('easter', 'Easter', 'Pacific/Easter'),
+    ('eastern', 'Eastern', 'Canada/Eastern'),
+    ('eastern', 'Eastern', 'US/Eastern'),
+    ('edmonton', 'Edmonton', 'America/Edmonton'),
+    ('efate', 'Efate', 'Pacific/Efate'),
+    ('eirunepe', 'Eirunepe', 'America/Eirunepe'),
+    ('el aaiun', 'El Aaiun', 'Africa/El_Aaiun'),
+    ('el salvador', 'El Salvador', 'America/El_Salvador'),
+    ('eucla', 'Eucla', 'Australia/Eucla'),
+    ('fakaofo', 'Fakaofo', 'Pacific/Fakaofo'),
+    ('famagusta', 'Famagusta', 'Asia/Famagusta'),
+    ('faroe', 'Faroe', 'Atlantic/Faroe'),
+    ('fiji', 'Fiji', 'Pacific/Fiji'),
+    ('fort nelson', 'Fort Nelson', 'America/Fort_Nelson'),
+    ('fortaleza', 'Fortaleza', 'America/Fortaleza'),
+    ('freetown', 'Freetown', 'Africa/Freetown'),
+    ('funafuti', 'Funafuti', 'Pacific/Funafuti'),
+    ('gaborone', 'Gaborone', 'Africa/Gaborone'),
+    ('galapagos', 'Galapagos', 'Pacific/Galapagos'),
+    ('gambier', 'Gambier', 'Pacific/Gambier'),
+    ('gaza', 'Gaza', 'Asia/Gaza'),
+    ('gibraltar', 'Gibraltar', 'Europe/Gibraltar'),
+    ('glace bay', 'Glace Bay', 'America/Glace_Bay'),
+    ('gmt', 'GMT', 'GMT'),
+    ('goose bay', 'Goose Bay', 'America/Goose_Bay'),
+    ('grand turk', 'Grand Turk', 'America/Grand_Turk'),
+    ('grenada', 'Grenada', 'America/Grenada'),
+    ('guadalcanal', 'Guadalcanal', 'Pacific/Guadalcanal'),
+    ('guadeloupe', 'Guadeloupe', 'America/Guadeloupe'),
+    ('guam', 'Guam', 'Pacific/Guam'),
+    ('guatemala', 'Guatemala', 'America/Guatemala'),
+    ('guayaquil', 'Guayaquil', 'America/Guayaquil'),
+    ('guernsey', 'Guernsey', 'Europe/Guernsey'),
+    ('guyana', 'Guyana', 'America/Guyana'),
+    ('halifax', 'Halifax', 'America/Halifax'),
+    ('harare', 'Harare', 'Africa/Harare'),
+    ('havana', 'Havana', 'America/Havana'),
+    ('hawaii', 'Hawaii', 'US/Hawaii'),
+    ('hebron', 'Hebron', 'Asia/Hebron'),
+    ('helsinki', 'Helsinki', 'Europe/Helsinki'),
+    ('hermosillo', 'Hermosillo', 'America/Hermosillo'),
+    ('ho chi minh', 'Ho Chi Minh', 'Asia/Ho_Chi_Minh'),
+    ('hobart', 'Hobart', 'Australia/Hobart'),
+    ('hong kong', 'Hong Kong', 'Asia/Hong_Kong'),
+    ('honolulu', 'Honolulu', 'Pacific/Honolulu'),
+    ('hovd', 'Hovd', 'Asia/Hovd'),
+    ('indianapolis', 'Indianapolis', 'America/Indiana/Indianapolis'),
+    ('inuvik', 'Inuvik', 'America/Inuvik'),
+    ('iqaluit', 'Iqaluit', 'America/Iqaluit'),
+    ('irkutsk', 'Irkutsk', 'Asia/Irkutsk'),
+    ('isle of man', 'Isle of Man', 'Europe/Isle_of_Man'),
+    ('istanbul', 'Istanbul', 'Europe/Istanbul'),
+    ('jakarta', 'Jakarta', 'Asia/Jakarta'),
+    ('jamaica', 'Jamaica', 'America/Jamaica'),
+    ('jayapura', 'Jayapura', 'Asia/Jayapura'),
+    ('jersey', 'Jersey', 'Europe/Jersey'),
+    ('jerusalem', 'Jerusalem', 'Asia/Jerusalem'),
+    ('johannesburg', 'Johannesburg', 'Africa/Johannesburg'),
+    ('juba', 'Juba', 'Africa/Juba'),
+    ('jujuy', 'Jujuy', 'America/Argentina/Jujuy'),
+    ('juneau', 'Juneau', 'America/Juneau'),
+    ('kabul', 'Kabul', 'Asia/Kabul'),
+    ('kaliningrad', 'Kaliningrad', 'Europe/Kaliningrad'),
+    ('kamchatka', 'Kamchatka', 'Asia/Kamchatka'),
+    ('kampala', 'Kampala', 'Africa/Kampala'),
+    ('kanton', 'Kanton', 'Pacific/Kanton'),
+    ('karachi', 'Karachi', 'Asia/Karachi'),
+    ('kathmandu', 'Kathmandu', 'Asia/Kathmandu'),
+    ('kerguelen', 'Kerguelen', 'Indian/Kerguelen'),
+    ('khandyga', 'Khandyga', 'Asia/Khandyga'),
+    ('khartoum', 'Khartoum', 'Africa/Khartoum'),
+    ('kigali', 'Kigali', 'Africa/Kigali'),
+    ('kinshasa', 'Kinshasa', 'Africa/Kinshasa'),
+    ('kiritimati', 'Kiritimati', 'Pacific/Kiritimati'),
+    ('kirov', 'Kirov', 'Europe/Kirov'),
+    ('knox', 'Knox', 'America/Indiana/Knox'),
+    ('kolkata', 'Kolkata', 'Asia/Kolkata'),
+    ('kosrae', 'Kosrae', 'Pacific/Kosrae'),
+    ('kralendijk', 'Kralendijk', 'America/Kralendijk'),
+    ('krasnoyarsk', 'Krasnoyarsk', 'Asia/Krasnoyarsk'),
+    ('kuala lumpur', 'Kuala Lumpur', 'Asia/Kuala_Lumpur'),
+    ('kuching', 'Kuching', 'Asia/Kuching'),
+    ('kuwait', 'Kuwait', 'Asia/Kuwait'),
+    ('kwajalein', 'Kwajalein', 'Pacific/Kwajalein'),
+    ('kyiv', 'Kyiv', 'Europe/Kyiv'),
+    ('la paz', 'La Paz', 'America/La_Paz'),
+    ('la rioja', 'La Rioja', 'America/Argentina/La_Rioja'),
+    ('lagos', 'Lagos', 'Africa/Lagos'),
+    ('libreville', 'Libreville', 'Africa/Libreville'),
+    ('lima', 'Lima', 'America/Lima'),
+    ('lindeman', 'Lindeman', 'Australia/Lindeman'),
+    ('lisbon', 'Lisbon', 'Europe/Lisbon'),
+    ('ljubljana', 'Ljubljana', 'Europe/Ljubljana'),
+    ('lome', 'Lome', 'Africa/Lome'),
+    ('london', 'London', 'Europe/London'),
+    ('longyearbyen', 'Longyearbyen', 'Arctic/Longyearbyen'),
+    ('lord howe', 'Lord Howe', 'Australia/Lord_Howe'),
+    ('los angeles', 'Los Angeles', 'America/Los_Angeles'),
+    ('louisville', 'Louisville', 'America/Kentucky/Louisville'),
+    ('lower princes', 'Lower Princes', 'America/Lower_Princes'),
+    ('luanda', 'Luanda', 'Africa/Luanda'),
+    ('lubumbashi', 'Lubumbashi', 'Africa/Lubumbashi'),
+    ('lusaka', 'Lusaka', 'Africa/Lusaka'),
+    ('luxembourg', 'Luxembourg', 'Europe/Luxembourg'),
+    ('macau', 'Macau', 'Asia/Macau'),
+    ('maceio', 'Maceio', 'America/Maceio'),
+    ('macquarie', 'Macquarie', 'Antarctica/Macquarie'),
+    ('madeira', 'Madeira', 'Atlantic/Madeira'),
+    ('madrid', 'Madrid', 'Europe/Madrid'),
+    ('magadan', 'Magadan', 'Asia/Magadan'),
+    ('mahe', 'Mahe', 'Indian/Mahe'),
+    ('majuro', 'Majuro', 'Pacific/Majuro'),
+    ('makassar', 'Makassar', 'Asia/Makassar'),
+    ('malabo', 'Malabo', 'Africa/Malabo'),
+    ('maldives', 'Maldives', 'Indian/Maldives'),
+    ('malta', 'Malta', 'Europe/Malta'),
+    ('managua', 'Managua', 'America/Managua'),
+    ('manaus', 'Manaus', 'America/Manaus'),
+    ('manila', 'Manila', 'Asia/Manila'),
+    ('maputo', 'Maputo', 'Africa/Maputo'),
+    ('marengo', 'Marengo', 'America/Indiana/Marengo'),
+    ('mariehamn', 'Mariehamn', 'Europe/Mariehamn'),
+    ('marigot', 'Marigot', 'America/Marigot'),
+    ('marquesas', 'Marquesas', 'Pacific/Marquesas'),
+    ('martinique', 'Martinique', 'America/Martinique'),
+    ('maseru', 'Maseru', 'Africa/Maseru'),
+    ('matamoros', 'Matamoros', 'America/Matamoros'),
+    ('mauritius', 'Mauritius', 'Indian/Mauritius'),
+    ('mawson', 'Mawson', 'Antarctica/Mawson'),
+    ('mayotte', 'Mayotte', 'Indian/Mayotte'),
+    ('mazatlan', 'Mazatlan', 'America/Mazatlan'),
+    ('mbabane', 'Mbabane', 'Africa/Mbabane'),
+    ('mcmurdo', 'McMurdo', 'Antarctica/McMurdo'),
+    ('melbourne', 'Melbourne', 'Australia/Melbourne'),
+    ('mendoza', 'Mendoza', 'America/Argentina/Mendoza'),
+    ('menominee', 'Menominee', 'America/Menominee'),
+    ('merida', 'Merida', 'America/Merida'),
+    ('metlakatla', 'Metlakatla', 'America/Metlakatla'),
+    ('mexico city', 'Mexico City', 'America/Mexico_City'),
+    ('midway', 'Midway', 'Pacific/Midway'),
+    ('minsk', 'Minsk', 'Europe/Minsk'),
+    ('miquelon', 'Miquelon', 'America/Miquelon'),
+    ('mogadishu', 'Mogadishu', 'Africa/Mogadishu'),
+    ('monaco', 'Monaco', 'Europe/Monaco'),
+    ('moncton', 'Moncton', 'America/Moncton'),
+    ('monrovia', 'Monrovia', 'Africa/Monrovia'),
+    ('monterrey', 'Monterrey', 'America/Monterrey'),
+    ('montevideo', 'Montevideo', 'America/Montevideo'),
+    ('monticello', 'Monticello', 'America/Kentucky/Monticello'),
+    ('montserrat', 'Montserrat', 'America/Montserrat'),
+    ('moscow', 'Moscow', 'Europe/Moscow'),
+    ('mountain', 'Mountain', 'Canada/Mountain'),
+    ('mountain', 'Mountain', 'US/Mountain'),
+    ('muscat', 'Muscat', 'Asia/Muscat'),
+    ('nairobi', 'Nairobi', 'Africa/Nairobi'),
+    ('nassau', 'Nassau', 'America/Nassau'),
+    ('nauru', 'Nauru', 'Pacific/Nauru'),
+    ('ndjamena', 'Ndjamena', 'Africa/Ndjamena'),
+    ('new salem', 'New Salem', 'America/North_Dakota/New_Salem'),
+    ('new york', 'New York', 'America/New_York'),
+    ('newfoundland', 'Newfoundland', 'Canada/Newfoundland'),
+    ('niamey', 'Niamey', 'Africa/Niamey'),
+    ('nicosia', 'Nicosia', 'Asia/Nicosia'),
+    ('niue', 'Niue', 'Pacific/Niue'),
+    ('nome', 'Nome', 'America/Nome'),
+    ('norfolk', 'Norfolk', 'Pacific/Norfolk'),
+    ('noronha', 'Noronha', 'America/Noronha'),
+    ('nouakchott', 'Nouakchott', 'Africa/Nouakchott'),
+    ('noumea', 'Noumea', 'Pacific/Noumea'),
+    ('novokuznetsk', 'Novokuznetsk', 'Asia/Novokuznetsk'),
+    ('novosibirsk', 'Novosibirsk', 'Asia/Novosibirsk'),
+    ('nuuk', 'Nuuk', 'America/Nuuk'),
+    ('ojinaga', 'Ojinaga', 'America/Ojinaga'),
+    ('omsk', 'Omsk', 'Asia/Omsk'),
+    ('oral', 'Oral', 'Asia/Oral'),
+    ('oslo', 'Oslo', 'Europe/Oslo'),
+    ('ouagadougou', 'Ouagadougou', 'Africa/Ouagadougou'),
+    ('pacific', 'Pacific', 'Canada/Pacific'),
+    ('pacific', 'Pacific', 'US/Pacific'),
+    ('pago pago', 'Pago Pago', 'Pacific/Pago_Pago'),
+    ('palau', 'Palau', 'Pacific/Palau'),
+    ('palmer', 'Palmer', 'Antarctica/Palmer'),
+    ('panama', 'Panama', 'America/Panama'),
+    ('paramaribo', 'Paramaribo', 'America/Paramaribo'),
+    ('paris', 'Paris', 'Europe/Paris'),
+    ('perth', 'Perth', 'Australia/Perth'),
+    ('petersburg', 'Petersburg', 'America/Indiana/Petersburg'),
+    ('phnom penh', 'Phnom Penh', 'Asia/Phnom_Penh'),
+    ('phoenix', 'Phoenix', 'America/Phoenix'),
+    ('pitcairn', 'Pitcairn', 'Pacific/Pitcairn'),
+    ('podgorica', 'Podgorica', 'Europe/Podgorica'),
+    ('pohnpei', 'Pohnpei', 'Pacific/Pohnpei'),
+    ('pontianak', 'Pontianak', 'Asia/Pontianak'),
+    ('port moresby', 'Port Moresby', 'Pacific/Port_Moresby'),
+    ('port of spain', 'Port of Spain', 'America/Port_of_Spain'),
+    ('port-au-prince', 'Port-au-Prince', 'America/Port-au-Prince'),
+    ('porto velho', 'Porto Velho', 'America/Porto_Velho'),
+    ('porto-novo', 'Porto-Novo', 'Africa/Porto-Novo'),
+    ('prague', 'Prague', 'Europe/Prague'),
+    ('puerto rico', 'Puerto Rico', 'America/Puerto_Rico'),
+    ('punta arenas', 'Punta Arenas', 'America/Punta_Arenas'),
+    ('pyongyang', 'Pyongyang', 'Asia/Pyongyang'),
+    ('qatar', 'Qatar', 'Asia/Qatar'),
+    ('qostanay', 'Qostanay', 'Asia/Qostanay'),
+    ('qyzylorda', 'Qyzylorda', 'Asia/Qyzylorda'),
+    ('rankin inlet', 'Rankin Inlet', 'America/Rankin_Inlet'),
+    ('rarotonga', 'Rarotonga', 'Pacific/Rarotonga'),
+    ('recife', 'Recife', 'America/Recife'),
+    ('regina', 'Regina', 'America/Regina'),
+    ('resolute', 'Resolute', 'America/Resolute'),
+    ('reunion', 'Reunion', 'Indian/Reunion'),
+    ('reykjavik', 'Reykjavik', 'Atlantic/Reykjavik'),
+    ('riga', 'Riga', 'Europe/Riga'),
+    ('rio branco', 'Rio Branco', 'America/Rio_Branco'),
+    ('rio gallegos', 'Rio Gallegos', 'America/Argentina/Rio_Gallegos'),
+    ('riyadh', 'Riyadh', 'Asia/Riyadh'),
+    ('rome', 'Rome', 'Europe/Rome'),
+    ('rothera', 'Rothera', 'Antarctica/Rothera'),
+    ('saipan', 'Saipan', 'Pacific/Saipan'),
+    ('sakhalin', 'Sakhalin', 'Asia/Sakhalin'),
+    ('salta', 'Salta', 'America/Argentina/Salta'),
+    ('samara', 'Samara', 'Europe/Samara'),
+    ('samarkand', 'Samarkand', 'Asia/Samarkand'),
+    ('san juan', 'San Juan', 'America/Argentina/San_Juan'),
+    ('san luis', 'San Luis', 'America/Argentina/San_Luis'),
+    ('san marino', 'San Marino', 'Europe/San_Marino'),
+    ('santarem', 'Santarem', 'America/Santarem'),
+    ('santiago', 'Santiago', 'America/Santiago'),
+    ('santo domingo', 'Santo Domingo', 'America/Santo_Domingo'),
+    ('sao paulo', 'Sao Paulo', 'America/Sao_Paulo'),
+    ('sao tome', 'Sao Tome', 'Africa/Sao_Tome'),
+    ('sarajevo', 'Sarajevo', 'Europe/Sarajevo'),
+    ('saratov', 'Saratov', 'Europe/Saratov'),
+    ('scoresbysund', 'Scoresbysund', 'America/Scoresbysund'),
+    ('seoul', 'Seoul', 'Asia/Seoul'),
+    ('shanghai', 'Shanghai', 'Asia/Shanghai'),
+    ('simferopol', 'Simferopol', 'Europe/Simferopol'),
+    ('singapore', 'Singapore', 'Asia/Singapore'),
+    ('sitka', 'Sitka', 'America/Sitka'),
+    ('skopje', 'Skopje', 'Europe/Skopje'),
+    ('sofia', 'Sofia', 'Europe/Sofia'),
+    ('south georgia', 'South Georgia', 'Atlantic/South_Georgia'),
+    ('srednekolymsk', 'Srednekolymsk', 'Asia/Srednekolymsk'),
+    ('st barthelemy', 'St Barthelemy', 'America/St_Barthelemy'),
+    ('st helena', 'St Helena', 'Atlantic/St_Helena'),
+    ('st johns', 'St Johns', 'America/St_Johns'),
+    ('st kitts', 'St Kitts', 'America/St_Kitts'),
+    ('st lucia', 'St Lucia', 'America/St_Lucia'),
+    ('st thomas', 'St Thomas', 'America/St_Thomas'),
+    ('st vincent', 'St Vincent', 'America/St_Vincent'),
+    ('stanley', 'Stanley', 'Atlantic/Stanley'),
+    ('stockholm', 'Stockholm', 'Europe/Stockholm'),
+    ('swift current', 'Swift Current', 'America/Swift_Current'),
+    ('sydney', 'Sydney', 'Australia/Sydney'),
+    ('syowa', 'Syowa', 'Antarctica/Syowa'),
+    ('tahiti', 'Tahiti', 'Pacific/Tahiti'),
+    ('taipei', 'Taipei', 'Asia/Taipei'),
+    ('tallinn', 'Tallinn', 'Europe/Tallinn'),
+    ('tarawa', 'Tarawa', 'Pacific/Tarawa'),
+    ('tashkent', 'Tashkent', 'Asia/Tashkent'),
+    ('tbilisi', 'Tbilisi', 'Asia/Tbilisi'),
+    ('tegucigalpa', 'Tegucigalpa', 'America/Tegucigalpa'),
+    ('tehran', 'Tehran', 'Asia/Tehran'),
+    ('tell city', 'Tell City', 'America/Indiana/Tell_City'),
+    ('thimphu', 'Thimphu', 'Asia/Thimphu'),
+    ('thule', 'Thule', 'America/Thule'),
+    ('tijuana', 'Tijuana', 'America/Tijuana'),
+    ('tirane', 'Tirane', 'Europe/Tirane'),
+    ('tokyo', 'Tokyo', 'Asia/Tokyo'),
+    ('tomsk', 'Tomsk', 'Asia/Tomsk'),
+    ('tongatapu', 'Tongatapu', 'Pacific/Tongatapu'),
+    ('toronto', 'Toronto', 'America/Toronto'),
+    ('tortola', 'Tortola', 'America/Tortola'),
+    ('tripoli', 'Tripoli', 'Africa/Tripoli'),
+    ('troll', 'Troll', 'Antarctica/Troll'),
+    ('tucuman', 'Tucuman', 'America/Argentina/Tucuman'),
+    ('tunis', 'Tunis', 'Africa/Tunis'),
+    ('ulaanbaatar', 'Ulaanbaatar', 'Asia/Ulaanbaatar'),
+    ('ulyanovsk', 'Ulyanovsk', 'Europe/Ulyanovsk'),
+    ('urumqi', 'Urumqi', 'Asia/Urumqi'),
+    ('ushuaia', 'Ushuaia', 'America/Argentina/Ushuaia'),
+    ('ust-nera', 'Ust-Nera', 'Asia/Ust-Nera'),
+    ('utc', 'UTC', 'UTC'),
+    ('vaduz', 'Vaduz', 'Europe/Vaduz'),
+    ('vancouver', 'Vancouver', 'America/Vancouver'),
+    ('vatican', 'Vatican', 'Europe/Vatican'),
+    ('vevay', 'Vevay', 'America/Indiana/Vevay'),
+    ('vienna', 'Vienna', 'Europe/Vienna'),
+    ('vientiane', 'Vientiane', 'Asia/Vientiane'),
+    ('vilnius', 'Vilnius', 'Europe/Vilnius'),
+    ('vincennes', 'Vincennes', 'America/Indiana/Vincennes'),
+    ('vladivostok', 'Vladivostok', 'Asia/Vladivostok'),
+    ('volgograd', 'Volgograd', 'Europe/Volgograd'),
+    ('vostok', 'Vostok', 'Antarctica/Vostok'),
+    ('wake', 'Wake', 'Pacific/Wake'),
+    ('wallis', 'Wallis', 'Pacific/Wallis'),
+    ('warsaw', 'Warsaw', 'Europe/Warsaw'),
+    ('whitehorse', 'Whitehorse', 'America/Whitehorse'),
+    ('winamac', 'Winamac', 'America/Indiana/Winamac'),
+    ('windhoek', 'Windhoek', 'Africa/Windhoek'),
+    ('winnipeg', 'Winnipeg', 'America/Winnipeg'),
+    ('yakutat', 'Yakutat', 'America/Yakutat'),
+    ('yakutsk', 'Yakutsk', 'Asia/Yakutsk'),
+    ('yangon', 'Yangon', 'Asia/Yangon'),
+    ('yekaterinburg', 'Yekaterinburg', 'Asia/Yekaterinburg'),
+    ('yerevan', 'Yerevan', 'Asia/Yerevan'),
+    ('zagreb', 'Zagreb', 'Europe/Zagreb'),
+    ('zurich', 'Zurich', 'Europe/Zurich'),
+)
@@ -0,0 +1,470 @@
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterable, List, Set, Tuple
+from collections import OrderedDict, Counter
+from dateutil import tz
+
+import functools
+import asyncio
+import logging
+import bisect
+import heapq
+import time
+import re
+
+try:
+    from .timezone_catalog import TIMEZONES
+except ImportError:
+    TIMEZONES = None
+
+logger = logging.getLogger(__name__)
+
+autocomplete = TIMEZONES is not None
+
+# NOTE: Discord only displays up to 25 autocomplete choices.
+MAX_CHOICES = 25
+
+# NOTE: Maximum number of seconds a single fuzzy search can take.
+FUZZY_BUDGET = 0.005
+
+# NOTE: The zone most people mean by a common abbreviation, the
+# first zone alphabetically often has different DST rules.
+PREFERRED_ZONES = {
+    'est': 'America/New_York',
+    'edt': 'America/New_York',
+    'cst': 'America/Chicago',
+    'cdt': 'America/Chicago',
+    'mst': 'America/Denver',
+    'mdt': 'America/Denver',
+    'pst': 'America/Los_Angeles',
+    'pdt': 'America/Los_Angeles',
+    'akst': 'America/Anchorage',
+    'akdt': 'America/Anchorage',
+    'hst': 'Pacific/Honolulu',
+    'gmt': 'Europe/London',
+    'bst': 'Europe/London',
+    'wet': 'Europe/Lisbon',
+    'west': 'Europe/Lisbon',
+    'cet': 'Europe/Paris',
+    'cest': 'Europe/Paris',
+    'eet': 'Europe/Athens',
+    'eest': 'Europe/Athens',
+    'ist': 'Asia/Kolkata',
+    'aest': 'Australia/Sydney',
+    'aedt': 'Australia/Sydney',
+    'nzst': 'Pacific/Auckland',
+    'nzdt': 'Pacific/Auckland'
+}
+
+OFFSET_PATTERN = re.compile(r'^(?:utc|gmt)?\s*([+-])\s*(\d{1,2})(?::?(\d{2}))?$')
+
+# NOTE: Using lru_cache instead of functools.cache since
+# the Python 3.8 shim for it lives in clovis.utils
+# which imports this module.
+@functools.lru_cache(maxsize=None)
+def load_timezones():
+    if autocomplete:
+        logger.debug(f"Detected the timezone catalog with {len(TIMEZONES)} timezones.")
+        return TIMEZONES
+    else:
+        logger.warning(
+            "The bot failed to detect the clovis/timezone_catalog.py file, "
+            "autocomplete will be disabled. Run create_timezones.py to generate it."
+        )
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    # NOTE: Levenshtein distance which gives up as soon as
+    # every path is guaranteed to be longer than the limit.
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, start=1):
+        current = [row]
+        for column, second_char in enumerate(second, start=1):
+            current.append(min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (first_char != second_char)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class TrigramIndex:
+    def __init__(self, keys: List[str]):
+        self.keys = keys
+        postings: Dict[str, Set[int]] = {}
+        for entry, key in enumerate(keys):
+            for trigram in trigrams(key):
+                postings.setdefault(trigram, set()).add(entry)
+        self.postings = {trigram: frozenset(entries) for trigram, entries in postings.items()}
+
+    @staticmethod
+    def max_distance(query: str) -> int:
+        if len(query) < 4:
+            return 0
+        return 1 if len(query) < 8 else 2
+
+    def substring(self, query: str) -> List[int]:
+        grams = sorted(trigrams(query), key=lambda gram: len(self.postings.get(gram, ())))
+        if not grams:
+            return []
+        candidates = set(self.postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self.postings.get(gram, frozenset())
+        return sorted(entry for entry in candidates if query in self.keys[entry])
+
+    def fuzzy(self, query: str, budget: float = FUZZY_BUDGET) -> List[Tuple[int, int]]:
+        if not (max_distance := self.max_distance(query)):
+            return []
+
+        deadline = time.perf_counter() + budget
+        counts: Counter = Counter()
+        for gram in trigrams(query):
+            counts.update(self.postings.get(gram, ()))
+
+        # NOTE: A string within max_distance edits of the query has to
+        # share at least this many trigrams with it (q-gram lemma).
+        needed = max(1, len(query) - 2 - 3 * max_distance)
+        matches = []
+        for entry, shared in counts.most_common():
+            if shared < needed:
+                break
+            if time.perf_counter() > deadline:
+                logger.debug(f"Fuzzy search for {query!r} ran out of time after {len(matches)} matches.")
+                break
+            key = self.keys[entry]
+            starts = [0] + [index + 1 for index, char in enumerate(key) if char in ' -']
+            distance = min(
+                min(
+                    edit_distance(query, key[start:start + len(query)], max_distance),
+                    edit_distance(query, key[start:], max_distance)
+                )
+                for start in starts
+            )
+            if distance <= max_distance:
+                matches.append((distance, entry))
+        matches.sort()
+        return matches
+
+
+class OffsetTable:
+    def __init__(self, zones: List[str], now: datetime = None):
+        if now is None:
+            now = datetime.now(timezone.utc)
+        # NOTE: Sampling January and July picks up the abbreviations
+        # used during both halves of the year (e.g. PST and PDT).
+        samples = [now, now.replace(month=1, day=1), now.replace(month=7, day=1)]
+
+        tzinfos = [tz.gettz(zone) for zone in zones]
+        self.offsets: List[timedelta] = []
+        self.by_offset: Dict[timedelta, List[int]] = {}
+        abbreviations: Dict[str, Dict[tuple, List[int]]] = {}
+        for entry, tzinfo in enumerate(tzinfos):
+            current = now.astimezone(tzinfo)
+            self.offsets.append(current.utcoffset())
+            self.by_offset.setdefault(current.utcoffset(), []).append(entry)
+            # NOTE: Zones are grouped by their offsets and abbreviations across
+            # the whole year, so EST in New York (EST/EDT) and EST in Panama
+            # (EST all year) are different meanings of the same abbreviation.
+            seasons = [sample.astimezone(tzinfo) for sample in samples[1:]]
+            pattern = tuple((local.utcoffset(), local.tzname()) for local in seasons)
+            for local in [current, *seasons]:
+                # NOTE: Zones without an abbreviation use their offset instead (e.g. -03).
+                if (abbreviation := local.tzname()) and abbreviation[0].isalpha():
+                    group = abbreviations.setdefault(abbreviation.lower(), {}).setdefault(pattern, [])
+                    if entry not in group:
+                        group.append(entry)
+
+        # NOTE: The same abbreviation can mean different offsets (e.g. PST in
+        # the Philippines). The group of the preferred zone is listed first,
+        # then the meaning shared by the most zones, then alphabetically.
+        entries_by_zone = {zone: entry for entry, zone in enumerate(zones)}
+        self.by_abbreviation: Dict[str, List[List[int]]] = {}
+        for abbreviation, groups in abbreviations.items():
+            preferred = entries_by_zone.get(PREFERRED_ZONES.get(abbreviation))
+            self.by_abbreviation[abbreviation] = sorted(
+                (
+                    sorted(group, key=lambda entry: (entry != preferred, entry))
+                    for group in groups.values()
+                ),
+                key=lambda group: (preferred not in group, -len(group), group[0])
+            )
+
+        self.expires = self.next_transition(tzinfos, now)
+
+    def next_transition(
+        self,
+        tzinfos: List[tzinfo],
+        now: datetime,
+        step: timedelta = timedelta(weeks=1),
+        horizon: timedelta = timedelta(days=366)
+    ) -> datetime:
+        # NOTE: Step forward until any zone changes its offset and
+        # then binary search the zones that changed within that step.
+        previous = now
+        while previous - now < horizon:
+            current = previous + step
+            changed = [
+                tzinfo
+                for tzinfo, offset in zip(tzinfos, self.offsets)
+                if current.astimezone(tzinfo).utcoffset() != offset
+            ]
+            if changed:
+                break
+            previous = current
+        else:
+            return previous
+
+        earliest = current
+        for tzinfo in changed:
+            low, high = previous, current
+            before = low.astimezone(tzinfo).utcoffset()
+            while high - low > timedelta(minutes=1):
+                middle = low + (high - low) / 2
+                if middle.astimezone(tzinfo).utcoffset() == before:
+                    low = middle
+                else:
+                    high = middle
+            earliest = min(earliest, high)
+        return earliest
+
+    def groups(self, query: str) -> List[List[int]]:
+        query = query.strip().lower()
+        if (match := OFFSET_PATTERN.match(query)):
+            sign, hours, minutes = match.groups()
+            offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+            return [entries] if (entries := self.by_offset.get(offset if sign == '+' else -offset)) else []
+        return self.by_abbreviation.get(query, [])
+
+    def match(self, query: str) -> List[int]:
+        return [entry for group in self.groups(query) for entry in group]
+
+    def local_time(self, entry: int, now: datetime = None) -> str:
+        if now is None:
+            now = datetime.now(timezone.utc)
+        return format(now + self.offsets[entry], '%I:%M %p')
+
+
+class TimeZoneIndex:
+    def __init__(self, timezones: Iterable[Tuple[str, str, str]]):
+        timezones = list(timezones)
+
+        candidates: Dict[str, List[str]] = {}
+        for key, _, timezone in timezones:
+            candidates.setdefault(key, []).append(timezone)
+
+        # NOTE: The same city can be listed under multiple regions
+        # (e.g. US/Pacific and Canada/Pacific), these cannot be
+        # resolved from the city name alone so they are only
+        # accepted in their Region/City form.
+        self.ambiguous = {key: zones for key, zones in candidates.items() if len(zones) > 1}
+        for key, zones in self.ambiguous.items():
+            logger.warning(f"The timezone name {key!r} is ambiguous between {', '.join(zones)}.")
+
+        # NOTE: The catalog is already sorted by key so an entry's
+        # position doubles as its alphabetical rank.
+        timezones.sort()
+        self.city_keys: List[str] = []
+        self.city_names: List[str] = []
+        self.city_zones: List[str] = []
+        self.lookup: Dict[str, str] = {}
+        regions: Dict[str, List[int]] = {}
+        for entry, (key, name, timezone) in enumerate(timezones):
+            self.lookup[self.normalize(timezone)] = timezone
+            if key in self.ambiguous:
+                name = timezone.replace('_', ' ')
+            else:
+                self.lookup[key] = timezone
+            if '/' in timezone:
+                region = self.normalize(timezone.rsplit('/', 1)[0]).split('/')[-1]
+                regions.setdefault(region, []).append(entry)
+            self.city_keys.append(key)
+            self.city_names.append(name)
+            self.city_zones.append(timezone)
+
+        self.region_keys = sorted(regions)
+        self.region_cities = [regions[key] for key in self.region_keys]
+
+        self.trigrams = TrigramIndex(self.city_keys)
+        self.offsets = OffsetTable(self.city_zones)
+        self.entries_by_zone = {timezone: entry for entry, timezone in enumerate(self.city_zones)}
+        self.popularity: Counter = Counter()
+        self.generation = 0
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return name.strip().replace('_', ' ').lower()
+
+    def resolve(self, name: str) -> str:
+        return self.lookup.get(self.normalize(name))
+
+    @staticmethod
+    def prefix_range(keys: List[str], prefix: str, lo: int = 0, hi: int = None) -> Tuple[int, int]:
+        if hi is None:
+            hi = len(keys)
+        start = bisect.bisect_left(keys, prefix, lo, hi)
+        return start, bisect.bisect_left(keys, prefix + '\U0010ffff', start, hi)
+
+    def ranges(self, prefix: str, bounds: Tuple[int, int, int, int] = None) -> Tuple[int, int, int, int]:
+        if bounds is None:
+            bounds = (0, len(self.region_keys), 0, len(self.city_keys))
+        region_lo, region_hi, city_lo, city_hi = bounds
+        return (
+            *self.prefix_range(self.region_keys, prefix, region_lo, region_hi),
+            *self.prefix_range(self.city_keys, prefix, city_lo, city_hi)
+        )
+
+    def extra(self, query: str, bounds: Tuple[int, int, int, int]) -> List[Tuple[int, int]]:
+        region_start, region_end, city_start, city_end = bounds
+        found = city_end - city_start + sum(map(len, self.region_cities[region_start:region_end]))
+
+        # NOTE: Substring matches rank right after region matches
+        # and typos rank after those depending on how many edits
+        # the query is away from the timezone.
+        # NOTE: The zone an abbreviation resolves to ranks first,
+        # then the zones sharing its offsets, then other meanings.
+        extra = [
+            (0 if rank == index == 0 else min(rank, 1) + 1, entry)
+            for rank, group in enumerate(self.offsets.groups(query))
+            for index, entry in enumerate(group)
+        ]
+        extra += [(3, entry) for entry in self.trigrams.substring(query)]
+        if found + len(extra) < MAX_CHOICES:
+            extra += [(3 + distance, entry) for distance, entry in self.trigrams.fuzzy(query)]
+        return extra
+
+    def rank(
+        self,
+        prefix: str,
+        bounds: Tuple[int, int, int, int],
+        extra: List[Tuple[int, int]] = (),
+        limit: int = MAX_CHOICES
+    ) -> List[int]:
+        region_start, region_end, city_start, city_end = bounds
+        tiers: Dict[int, int] = {}
+        for entry in range(city_start, city_end):
+            tiers[entry] = 0 if self.city_keys[entry] == prefix else 1
+        for entries in self.region_cities[region_start:region_end]:
+            for entry in entries:
+                tiers.setdefault(entry, 2)
+        for tier, entry in extra:
+            tiers.setdefault(entry, tier)
+
+        best = heapq.nsmallest(
+            limit,
+            tiers,
+            key=lambda entry: (tiers[entry], -self.popularity[entry], entry)
+        )
+        return best
+
+    def search(self, prefix: str, limit: int = MAX_CHOICES) -> List[str]:
+        prefix = prefix.lower()
+        bounds = self.ranges(prefix)
+        return [self.city_names[entry] for entry in self.rank(prefix, bounds, self.extra(prefix, bounds), limit)]
+
+    def resolve_offset(self, name: str) -> str:
+        # NOTE: Every zone in the first group has the same offsets all
+        # year, so the most used one is picked, any of them would work.
+        if (groups := self.offsets.groups(name)):
+            _, entry = min(enumerate(groups[0]), key=lambda item: (-self.popularity[item[1]], item[0]))
+            return self.city_zones[entry]
+
+    def candidates(self, name: str) -> List[str]:
+        name = self.normalize(name)
+        if name in self.ambiguous:
+            return self.ambiguous[name]
+        if not (entries := self.trigrams.substring(name)):
+            matches = self.trigrams.fuzzy(name)
+            entries = [entry for distance, entry in matches if distance == matches[0][0]]
+        return [self.city_zones[entry] for entry in entries]
+
+    def record_use(self, timezone: str):
+        if (entry := self.entries_by_zone.get(timezone)) is not None:
+            self.popularity[entry] += 1
+            self.generation += 1
+
+
+class PrefixCache:
+    def __init__(self, index: TimeZoneIndex, maxsize: int = 1024):
+        self.index = index
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[str, Tuple[Tuple[int, int, int, int], List[Tuple[int, int]], int, List[int]]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self.entries.clear()
+
+    def get(self, prefix: str) -> List[int]:
+        prefix = prefix.lower()
+        if (entry := self.entries.get(prefix)) is not None:
+            self.hits += 1
+            self.entries.move_to_end(prefix)
+            bounds, extra, generation, results = entry
+            if generation != self.index.generation:
+                # NOTE: The popularity of the timezones changed since
+                # this was cached, the matches are still valid though.
+                results = self.index.rank(prefix, bounds, extra)
+                self.entries[prefix] = (bounds, extra, self.index.generation, results)
+            return results
+
+        self.misses += 1
+        # NOTE: Every prefix match for a prefix is also a match for all
+        # of its ancestors, so the ranges of the longest cached ancestor
+        # can be narrowed instead of searching the whole index again.
+        bounds = None
+        for length in range(len(prefix) - 1, -1, -1):
+            if (ancestor := self.entries.get(prefix[:length])) is not None:
+                bounds = ancestor[0]
+                break
+
+        bounds = self.index.ranges(prefix, bounds)
+        extra = self.index.extra(prefix, bounds)
+        results = self.index.rank(prefix, bounds, extra)
+        self.entries[prefix] = (bounds, extra, self.index.generation, results)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return results
+
+
+@functools.lru_cache(maxsize=None)
+def timezone_index() -> TimeZoneIndex:
+    index = TimeZoneIndex(load_timezones())
+    logger.debug(f"Built the timezone prefix index with {len(index.city_keys)} timezones.")
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def autocomplete_cache() -> PrefixCache:
+    return PrefixCache(timezone_index())
+
+
+async def refresh_offsets():
+    index = timezone_index()
+    loop = asyncio.get_running_loop()
+    while True:
+        logger.info(f"The timezone offsets will be refreshed at {index.offsets.expires}.")
+        await asyncio.sleep(max((index.offsets.expires - datetime.now(timezone.utc)).total_seconds(), 0))
+        try:
+            index.offsets = await loop.run_in_executor(None, OffsetTable, index.city_zones)
+        except Exception as error:
+            logger.error("Failed to refresh the timezone offsets, retrying in a minute.", exc_info=error)
+            await asyncio.sleep(60)
+            continue
+        # NOTE: Cached results may contain matches for the old offsets.
+        autocomplete_cache().clear()
+        logger.info("Successfully refreshed the timezone offsets.")
@@ -1,22 +1,22 @@
 from discord.ext.pages import Paginator, PaginatorButton
 from discord.ext.commands import Converter, BadArgument
 from datetime import datetime, timedelta
-from typing import Dict, Set, List, Any
+from typing import Awaitable, Callable, Dict, Hashable, Set, List, Any, Optional, TypeVar
 from more_itertools import chunked
-from bs4 import BeautifulSoup
 
-from . import sessionmaker
+from .timezones import timezone_index, autocomplete_cache, autocomplete
+from .web import get_session
+from . import config
 
 import dataclasses
 import functools
+import html
 import aiohttp
 import asyncio
 import discord
-import pathlib
 import logging
-import pandas
 import pprint
-import json
+import re
 import time
 
 logger = logging.getLogger(__name__)
@@ -46,6 +46,8 @@ if not hasattr(functools, 'cache'):
 
 commands = logging.getLogger('clovis.commands')
 
+T = TypeVar('T')
+
 
 class MissingCategoryChannel(discord.DiscordException):
     pass
@@ -55,22 +57,70 @@ class HTMLChangeError(Exception):
     pass
 
 
+ONLOAD_CHUNK_SIZE = 1024
+# NOTE: How much of the <body> tag is read before giving up on finding onload.
+ONLOAD_LIMIT = 64 * 1024
+BODY_TAG = re.compile(rb'<body\b[^>]*>', re.IGNORECASE)
+BODY_ONLOAD = re.compile(
+    rb"""<body\b[^>]*?\sonload\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)(?=[\s>]))""",
+    re.IGNORECASE
+)
+
+
+async def read_body_onload(content: aiohttp.StreamReader) -> str:
+    # NOTE: Only the onload attribute of the <body> tag is needed, so the
+    # response is scanned chunk by chunk and reading stops as soon as the
+    # attribute has been seen instead of parsing the whole page.
+    buffer = b''
+    found_body = False
+    async for chunk in content.iter_chunked(ONLOAD_CHUNK_SIZE):
+        buffer += chunk
+        if not found_body:
+            if (start := buffer.lower().find(b'<body')) == -1:
+                # NOTE: Keep enough to match a tag split between chunks.
+                buffer = buffer[-len(b'<body') + 1:]
+                continue
+            buffer = buffer[start:]
+            found_body = True
+        if (match := BODY_ONLOAD.match(buffer)):
+            value = next(group for group in match.groups() if group is not None)
+            return html.unescape(value.decode(errors='replace'))
+        if BODY_TAG.match(buffer) or len(buffer) > ONLOAD_LIMIT:
+            break
+    raise HTMLChangeError(
+        'The when2meet HTML code has changed! '
+        'You need to update this portion of code '
+        'to be able to analyze the new HTML.'
+    )
+
+
 class TimeZoneConverter(Converter):
     async def convert(self, ctx: discord.ApplicationContext, argument: str):
-        format_tz_str = lambda tz_str: tz_str.replace(' ', '_').title()
-
-        for timezone, series in load_timezones().items():
-            if not (filtered := series[series.isin([argument.lower()])]).empty:
-                timezone_str = f"{format_tz_str(timezone)}/{format_tz_str(filtered.iloc[0])}"
-                commands.debug(f'Converted {argument} to valid timezone: {timezone_str}')
-                return timezone_str
-        bad_argument = BadArgument(f"'{argument}' is not a valid timezone.")
+        index = timezone_index()
+        timezone_str = index.resolve(argument) or index.resolve_offset(argument)
+        if timezone_str is None:
+            zones = index.candidates(argument)
+            if len(zones) == 1:
+                timezone_str = zones[0]
+        if timezone_str:
+            index.record_use(timezone_str)
+            commands.debug(f'Converted {argument} to valid timezone: {timezone_str}')
+            return timezone_str
+
+        if zones:
+            bad_argument = BadArgument(
+                f"'{argument}' is an ambiguous timezone, it could be any of: {', '.join(zones[:5])}."
+            )
+        else:
+            bad_argument = BadArgument(f"'{argument}' is not a valid timezone.")
         bad_argument.bad_argument = argument
         raise bad_argument
 
 
 @dataclasses.dataclass
 class When2Meet:
+    BASE_URL = 'https://www.when2meet.com'
+
     event_name: str
     no_earlier_than: int
     no_later_than: int
@@ -134,22 +184,19 @@ class When2Meet:
 
         return payload
 
-    async def create_event(self):
-        async with aiohttp.request(
-            'POST',
-            'https://www.when2meet.com/SaveNewEvent.php',
-            data=self.create_payload()
-        ) as resp:
+    async def create_event(self, session: Optional[aiohttp.ClientSession] = None, base_url: Optional[str] = None):
+        # NOTE: The session and base url can be swapped out
+        # to send the request to a local stand-in server.
+        session = session or get_session()
+        base_url = base_url or self.BASE_URL
+        async with session.post(f'{base_url}/SaveNewEvent.php', data=self.create_payload()) as resp:
             resp.raise_for_status()
-            soup = BeautifulSoup(await resp.text(), 'html.parser')
-        try:
-            return f"https://www.when2meet.com/{soup.body['onload'].split('/')[-1][:-1]}"
-        except (KeyError, IndexError) as error:
-            raise HTMLChangeError(
-                'The when2meet HTML code has changed! '
-                'You need to update this portion of code '
-                'to be able to analyze the new HTML.'
-            ) from error
+            onload = await read_body_onload(resp.content)
+            # NOTE: The rest of the page is read and thrown away so
+            # the connection can be reused by the next request.
+            async for _ in resp.content.iter_chunked(ONLOAD_CHUNK_SIZE):
+                pass
+        return f"{base_url}/{onload.split('/')[-1][:-1]}"
 
 
 class When2MeetPaginator(Paginator):
@@ -423,8 +470,7 @@ class WelcomeModal(discord.ui.Modal):
         args = [self._ctx.bot.user.mention]
         message = None
         try:
-            async with sessionmaker.begin() as session:
-                sql_guild = await Guild.get_or_create(session, interaction.guild_id)
+            async with guild_settings.edit(interaction.guild_id) as sql_guild:
                 if sql_guild.welcome_channel_id:
                     args.append(sql_guild.mention_welcome)
                 try:
@@ -482,46 +528,96 @@ async def hardened_fetch_channel(channel_id: int, guild: discord.Guild, default:
             raise error from not_found
         return default
 
-timezones_json = pathlib.Path('timezones.json')
-autocomplete = timezones_json.exists()
-
-@functools.cache
-def load_timezones():
-    if autocomplete:
-        with timezones_json.open() as file:
-            timezones: Dict[str, pandas.Series] = json.load(file)
-            for timezone in timezones:
-                timezones[timezone] = pandas.Series(timezones[timezone])
-        logger.debug("Detected the timezones.json file and loaded into RAM.")
-        return timezones
-    else:
-        logger.warning(
-            "The bot failed to detect the timezones.json file, "
-            "autocomplete will be disabled."
-        )
+def private_channel_owner(channel: discord.TextChannel) -> Optional[discord.Member]:
+    # NOTE: Private channels are created with a single member
+    # overwrite for the person the channel belongs to.
+    owners = [
+        target
+        for target, overwrite in channel.overwrites.items()
+        if isinstance(target, discord.Member)
+        and overwrite.view_channel
+        and not target.guild_permissions.administrator
+    ]
+    if len(owners) == 1:
+        return owners[0]
+
+async def single_flight(in_flight: Dict[Hashable, asyncio.Future], key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+    # NOTE: Concurrent calls with the same key wait for the one already
+    # running and share its result (or exception) instead of repeating it.
+    if (future := in_flight.get(key)) is not None:
+        return await asyncio.shield(future)
+
+    future = in_flight[key] = asyncio.get_running_loop().create_future()
+    try:
+        result = await call()
+        future.set_result(result)
+    except Exception as error:
+        future.set_exception(error)
+        # NOTE: Mark the exception as retrieved in case no one else was waiting.
+        future.exception()
+        raise
+    finally:
+        if not future.done():
+            future.cancel()
+        del in_flight[key]
+    return result
 
 autocomplete_logger = logging.getLogger('clovis.autocomplete')
 
+
+class AutocompleteTracker:
+    def __init__(self):
+        self.latest: Dict[int, int] = {}
+        self.dropped = 0
+
+    def start(self, user_id: int, token: int):
+        self.latest[user_id] = token
+
+    def superseded(self, user_id: int, token: int) -> bool:
+        return self.latest.get(user_id) != token
+
+    def finish(self, user_id: int, token: int):
+        if self.latest.get(user_id) == token:
+            del self.latest[user_id]
+
+
+autocomplete_tracker = AutocompleteTracker()
+
 async def autocomplete_timezones(ctx: discord.AutocompleteContext):
+    # NOTE: Every keystroke is a new interaction, so wait a little
+    # to see if a newer one from the same user shows up before
+    # doing any work for this one.
+    user_id, token = ctx.interaction.user.id, ctx.interaction.id
+    autocomplete_tracker.start(user_id, token)
+    if config.autocomplete_coalesce > 0:
+        await asyncio.sleep(config.autocomplete_coalesce)
+    if autocomplete_tracker.superseded(user_id, token):
+        autocomplete_tracker.dropped += 1
+        autocomplete_logger.debug(
+            f"Dropped the autocomplete request for {ctx.value!r} from {ctx.interaction.user} "
+            f"since a newer one arrived. Dropped {autocomplete_tracker.dropped} requests so far."
+        )
+        return []
+    autocomplete_tracker.finish(user_id, token)
+
     start = time.perf_counter()
     message = f"Autocomplete received {ctx.value!r} as input and took {{}} seconds to respond. It is returning "
-    timezones = load_timezones()
-    starting = []
-    for full_timezone in timezones:
-        timezone = full_timezone
-        if '/' in timezone:
-            timezone = timezone.split('/')[-1]
-        if timezone.startswith(ctx.value.lower()):
-            starting += timezones[full_timezone].str.title().to_list()
-
-    if starting:
-        autocomplete_logger.info(message.format(time.perf_counter() - start) + pprint.pformat(starting))
-        return starting
-
-    for series in timezones.values():
-        starting += series[series.str.startswith(ctx.value.lower())].str.title().to_list()
-
-    autocomplete_logger.info(message.format(time.perf_counter() - start) + pprint.pformat(starting))
+    cache = autocomplete_cache()
+    index = cache.index
+    now = datetime.utcnow()
+    starting = [
+        discord.OptionChoice(
+            f"{index.city_names[entry]} ({index.offsets.local_time(entry, now)})",
+            index.city_names[entry]
+        )
+        for entry in cache.get(ctx.value)
+    ]
+
+    autocomplete_logger.info(
+        message.format(time.perf_counter() - start)
+        + pprint.pformat([choice.name for choice in starting])
+        + f"\nCache hits: {cache.hits}, misses: {cache.misses} ({cache.hit_rate:.1%} hit rate)."
+    )
     return starting
 
-from .tables import Guild
+from .settings import guild_settings
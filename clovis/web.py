@@ -0,0 +1,39 @@
+from typing import Optional
+
+import aiohttp
+import logging
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def start_session(limit: int, timeout: float, dns_ttl: int) -> aiohttp.ClientSession:
+    # NOTE: One session is shared for the lifetime of the bot so requests
+    # reuse kept alive connections and cached DNS lookups instead of
+    # setting up a new connector, DNS lookup and TLS handshake each time.
+    global _session
+    _session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=limit,
+            ttl_dns_cache=dns_ttl,
+            keepalive_timeout=30
+        ),
+        timeout=aiohttp.ClientTimeout(total=timeout, connect=min(timeout, 10))
+    )
+    logger.info(f"Started the shared HTTP session with at most {limit} connections.")
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+        logger.info("Closed the shared HTTP session.")
+
+
+def get_session() -> aiohttp.ClientSession:
+    if _session is None:
+        raise RuntimeError('The shared HTTP session has not been started, call start_session() first.')
+    return _session
@@ -1,37 +1,26 @@
-import json
+import pathlib
 import pytz
 
-locations = {
-    'africa',
-    'america',
-    'antarctica',
-    'arctic',
-    'asia',
-    'atlantic',
-    'australia',
-    'canada',
-    'europe',
-    # 'gmt',
-    'indian',
-    'pacific',
-    'us',
-    'america/argentina',
-    'america/indiana',
-    'america/kentucky',
-    'america/north dakota',
-    'america/indiana'
-}
+catalog = pathlib.Path('clovis') / 'timezone_catalog.py'
 
-timezones = {location: [] for location in locations}
+timezones = []
 
 for timezone in pytz.common_timezones:
     # print(f"{timezone=}")
-    for location in locations:
-        # print(f"{location=}")
-        if timezone.replace('_', ' ').lower().startswith(location):
-            appending = timezone[len(f'{location}/'):].replace('_', ' ').lower()
-            if '/' not in appending:
-                timezones[location].append(appending)
+    name = timezone.split('/')[-1].replace('_', ' ')
+    timezones.append((name.lower(), name, timezone))
 
-with open('timezones.json', 'w') as file:
-    json.dump(timezones, file, indent=4)
+timezones.sort()
+
+with catalog.open('w') as file:
+    file.write(
+        '# NOTE: This file is generated by create_timezones.py, do not edit it by hand.\n'
+        '# Each entry is (key, name, timezone) where key is the normalized city name,\n'
+        '# name is the display name and timezone is the canonical IANA timezone.\n'
+        f'# Generated from pytz {pytz.__version__}.\n'
+        '\n'
+        'TIMEZONES = (\n'
+    )
+    for entry in timezones:
+        file.write(f'    {entry!r},\n')
+    file.write(')\n')